@@ -0,0 +1,411 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Awaitable, Callable
+
+import factory
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from testcontainers.postgres import PostgresContainer
+
+from benchmarks.login_contention import percentiles
+from fast_zero.db.models import Todo, User, table_registry
+from fast_zero.helpers.security import pwd_context
+from tests.factories import TodoFactory, UserFactory
+
+PASSWORD = 'benchmark-password'
+SEARCH_TERMS = ['system', 'people', 'market', 'game', 'world']
+BATCH_SIZE = 10
+UNLIMITED_LOGINS = {
+    'LOGIN_IP_BURST': '1000000',
+    'LOGIN_IP_PER_MINUTE': '1000000',
+    'LOGIN_USERNAME_BURST': '1000000',
+    'LOGIN_USERNAME_PER_MINUTE': '1000000',
+}
+
+
+@dataclass
+class Worker:
+    email: str
+    token: str = ''
+    todo_ids: list[int] = field(default_factory=list)
+    created_users: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {'Authorization': f'Bearer {self.token}'}
+
+
+Scenario = Callable[
+    [httpx.AsyncClient, Worker, int], Awaitable[httpx.Response]
+]
+
+
+async def seed(url: str, args: argparse.Namespace) -> list[str]:
+    engine = create_async_engine(url)
+    password = pwd_context.hash(PASSWORD)
+    start = perf_counter()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        users = factory.build_batch(
+            dict, args.users, FACTORY_CLASS=UserFactory, password=password
+        )
+        user_ids = (
+            await session.scalars(insert(User).returning(User.id), users)
+        ).all()
+
+        for offset in range(0, args.todos, args.seed_batch):
+            todos = factory.build_batch(
+                dict,
+                min(args.seed_batch, args.todos - offset),
+                FACTORY_CLASS=TodoFactory,
+            )
+
+            for index, todo in enumerate(todos, start=offset):
+                todo['user_id'] = user_ids[index % len(user_ids)]
+
+            await session.execute(insert(Todo), todos)
+
+        await session.commit()
+
+    await engine.dispose()
+    print(
+        f'seeded {args.users} users and {args.todos} todos '
+        f'in {perf_counter() - start:.1f}s',
+        file=sys.stderr,
+    )
+
+    return [user['email'] for user in users]
+
+
+async def login(client: httpx.AsyncClient, email: str) -> httpx.Response:
+    return await client.post(
+        '/auth/token', data={'username': email, 'password': PASSWORD}
+    )
+
+
+async def token_for(client: httpx.AsyncClient, email: str) -> str:
+    response = await login(client, email)
+
+    return response.json()['access_token']
+
+
+async def refresh_token(client, worker, n):
+    return await client.post('/auth/refresh_token', headers=worker.headers)
+
+
+async def get_users(client, worker, n):
+    return await client.get(
+        '/users/', params={'offset': n % 50 * 20}, headers=worker.headers
+    )
+
+
+async def get_user(client, worker, n):
+    return await client.get(
+        f'/users/{random.randint(1, 1000)}', headers=worker.headers
+    )
+
+
+async def get_todos(client, worker, n):
+    return await client.get(
+        '/todos/', params={'offset': n % 5 * 20}, headers=worker.headers
+    )
+
+
+async def search_todos(client, worker, n):
+    return await client.get(
+        '/todos/',
+        params={'q': random.choice(SEARCH_TERMS)},
+        headers=worker.headers,
+    )
+
+
+async def export_todos(client, worker, n):
+    return await client.get('/todos/export', headers=worker.headers)
+
+
+async def todo_stats(client, worker, n):
+    return await client.get('/todos/stats', headers=worker.headers)
+
+
+async def create_user(client, worker, n):
+    username = f'load-{worker.email.split("@")[0]}-{n}'
+    response = await client.post(
+        '/users/',
+        json={
+            'username': username,
+            'email': f'{username}@bench.com',
+            'password': PASSWORD,
+        },
+    )
+    worker.created_users.append((
+        response.json()['id'],
+        f'{username}@bench.com',
+    ))
+
+    return response
+
+
+async def update_user(client, worker, n):
+    user_id, email = worker.created_users[n % len(worker.created_users)]
+    token = await token_for(client, email)
+
+    return await client.put(
+        f'/users/{user_id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': email.split('@')[0],
+            'email': email,
+            'password': PASSWORD,
+        },
+    )
+
+
+async def delete_user(client, worker, n):
+    user_id, email = worker.created_users.pop()
+    token = await token_for(client, email)
+
+    return await client.delete(
+        f'/users/{user_id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+
+async def create_todo(client, worker, n):
+    response = await client.post(
+        '/todos/',
+        headers=worker.headers,
+        json={'title': f'load {n}', 'description': 'load test'},
+    )
+    worker.todo_ids.append(response.json()['id'])
+
+    return response
+
+
+async def create_todos(client, worker, n):
+    response = await client.post(
+        '/todos/batch',
+        headers=worker.headers,
+        json={
+            'todos': [{'title': f'batch {n}', 'description': 'load test'}]
+            * BATCH_SIZE
+        },
+    )
+    worker.todo_ids.extend(
+        result['id'] for result in response.json()['results']
+    )
+
+    return response
+
+
+async def patch_todo(client, worker, n):
+    return await client.patch(
+        f'/todos/{worker.todo_ids[n % len(worker.todo_ids)]}',
+        headers=worker.headers,
+        json={'state': 'doing'},
+    )
+
+
+async def patch_todos(client, worker, n):
+    return await client.patch(
+        '/todos/batch',
+        headers=worker.headers,
+        json={
+            'todos': [
+                {'id': todo_id, 'state': 'done'}
+                for todo_id in worker.todo_ids[:BATCH_SIZE]
+            ]
+        },
+    )
+
+
+async def delete_todo(client, worker, n):
+    return await client.delete(
+        f'/todos/{worker.todo_ids.pop()}', headers=worker.headers
+    )
+
+
+async def delete_todos(client, worker, n):
+    ids = [worker.todo_ids.pop() for _ in range(BATCH_SIZE)]
+
+    return await client.request(
+        'DELETE', '/todos/batch', headers=worker.headers, json={'ids': ids}
+    )
+
+
+ROUTES: list[tuple[str, str, Scenario]] = [
+    (
+        'POST /auth/token',
+        'POST /auth/token',
+        lambda c, w, n: login(c, w.email),
+    ),
+    ('POST /auth/refresh_token', 'POST /auth/refresh_token', refresh_token),
+    ('GET /users/', 'GET /users/', get_users),
+    ('GET /users/{user_id}', 'GET /users/{user_id}', get_user),
+    ('GET /todos/', 'GET /todos/', get_todos),
+    ('GET /todos/?q=', 'GET /todos/', search_todos),
+    ('GET /todos/export', 'GET /todos/export', export_todos),
+    ('GET /todos/stats', 'GET /todos/stats', todo_stats),
+    ('POST /users/', 'POST /users/', create_user),
+    ('PUT /users/{user_id}', 'PUT /users/{user_id}', update_user),
+    ('POST /todos/', 'POST /todos/', create_todo),
+    ('POST /todos/batch', 'POST /todos/batch', create_todos),
+    ('PATCH /todos/{todo_id}', 'PATCH /todos/{todo_id}', patch_todo),
+    ('PATCH /todos/batch', 'PATCH /todos/batch', patch_todos),
+    ('DELETE /todos/{todo_id}', 'DELETE /todos/{todo_id}', delete_todo),
+    ('DELETE /todos/batch', 'DELETE /todos/batch', delete_todos),
+    ('DELETE /users/{user_id}', 'DELETE /users/{user_id}', delete_user),
+]
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    workers: list[Worker],
+    scenario: Scenario,
+    requests: int,
+) -> dict[str, float]:
+    samples = []
+    errors = 0
+
+    async def run(worker: Worker) -> None:
+        nonlocal errors
+
+        for n in range(requests // len(workers)):
+            start = perf_counter()
+            response = await scenario(client, worker, n)
+            samples.append(perf_counter() - start)
+            errors += response.is_error
+
+    start = perf_counter()
+    await asyncio.gather(*(run(worker) for worker in workers))
+    elapsed = perf_counter() - start
+
+    report = percentiles(samples)
+    report['errors'] = errors
+    report['requests_per_second'] = round(len(samples) / elapsed, 1)
+
+    return report
+
+
+async def wait_until_ready(client: httpx.AsyncClient) -> None:
+    for _ in range(100):
+        try:
+            await client.get('/')
+            return
+
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+
+    raise SystemExit('server did not start')
+
+
+async def run_suite(url: str, args: argparse.Namespace) -> dict:
+    emails = await seed(url, args)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            'fast_zero.app:app',
+            '--port',
+            str(args.port),
+            '--log-level',
+            'warning',
+        ],
+        env={
+            **os.environ,
+            **UNLIMITED_LOGINS,
+            'ADMIN_EMAILS': json.dumps(emails[:1]),
+            'DATABASE_URL': url,
+        },
+    )
+
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+
+        async with httpx.AsyncClient(
+            base_url=f'http://127.0.0.1:{args.port}',
+            limits=limits,
+            timeout=60,
+        ) as client:
+            await wait_until_ready(client)
+
+            workers = [Worker(email) for email in emails[: args.concurrency]]
+
+            for worker in workers:
+                worker.token = await token_for(client, worker.email)
+
+            report = {}
+
+            for name, _, scenario in ROUTES:
+                report[name] = await drive(
+                    client, workers, scenario, args.requests
+                )
+
+            response = await client.get(
+                '/metrics/queries', headers=workers[0].headers
+            )
+            queries = response.json()
+
+            for name, metrics_key, _ in ROUTES:
+                report[name]['queries_per_request'] = queries.get(
+                    metrics_key, {}
+                ).get('queries_per_request')
+
+    finally:
+        server.terminate()
+        server.wait()
+
+    return report
+
+
+async def main(args: argparse.Namespace) -> None:
+    container = (
+        nullcontext()
+        if args.database_url
+        else PostgresContainer('postgres:17', driver='psycopg')
+    )
+
+    with container as postgres:
+        url = args.database_url or postgres.get_connection_url()
+        routes = await run_suite(url, args)
+
+    print(
+        json.dumps(
+            {
+                'users': args.users,
+                'todos': args.todos,
+                'concurrency': args.concurrency,
+                'routes': routes,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Throughput, latency and query counts for every route.'
+    )
+    parser.add_argument(
+        '--database-url',
+        help='Use an existing empty database instead of a container.',
+    )
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--todos', type=int, default=1_000_000)
+    parser.add_argument('--seed-batch', type=int, default=10_000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--port', type=int, default=8765)
+
+    asyncio.run(main(parser.parse_args()))
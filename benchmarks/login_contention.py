@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import json
+import statistics
+from collections import Counter
+from time import perf_counter
+from uuid import uuid4
+
+import httpx
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+
+    return {
+        'count': len(samples),
+        'p50_ms': round(cuts[49] * 1000, 2),
+        'p95_ms': round(cuts[94] * 1000, 2),
+        'p99_ms': round(cuts[98] * 1000, 2),
+    }
+
+
+async def create_user(client: httpx.AsyncClient) -> tuple[str, str]:
+    username = f'bench-{uuid4().hex[:8]}'
+    email = f'{username}@bench.com'
+    password = 'bench-password'
+
+    await client.post(
+        '/users/',
+        json={'username': username, 'email': email, 'password': password},
+    )
+
+    return email, password
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post(
+        '/auth/token', data={'username': email, 'password': password}
+    )
+
+    return response.json()['access_token']
+
+
+async def poll_todos(
+    client: httpx.AsyncClient, token: str, stop: asyncio.Event
+) -> list[float]:
+    headers = {'Authorization': f'Bearer {token}'}
+    samples = []
+
+    while not stop.is_set():
+        start = perf_counter()
+        await client.get('/todos/', headers=headers)
+        samples.append(perf_counter() - start)
+
+    return samples
+
+
+async def login_storm(
+    client: httpx.AsyncClient, email: str, stop: asyncio.Event
+) -> Counter[int]:
+    statuses = Counter()
+
+    while not stop.is_set():
+        response = await client.post(
+            '/auth/token', data={'username': email, 'password': 'wrong'}
+        )
+        statuses[response.status_code] += 1
+
+    return statuses
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    token: str,
+    email: str,
+    logins: int,
+    args: argparse.Namespace,
+) -> dict[str, float]:
+    stop = asyncio.Event()
+
+    poll_tasks = [
+        asyncio.create_task(poll_todos(client, token, stop))
+        for _ in range(args.pollers)
+    ]
+    storm_tasks = [
+        asyncio.create_task(login_storm(client, email, stop))
+        for _ in range(logins)
+    ]
+
+    await asyncio.sleep(args.duration)
+    stop.set()
+
+    samples = sum(await asyncio.gather(*poll_tasks), [])
+    statuses = sum(await asyncio.gather(*storm_tasks), Counter())
+
+    if statuses[httpx.codes.TOO_MANY_REQUESTS]:
+        raise SystemExit(
+            f'{statuses[httpx.codes.TOO_MANY_REQUESTS]} of '
+            f'{statuses.total()} storm logins were rate limited, so they '
+            'never reached argon2. Start the server with the LOGIN_*_BURST '
+            'and LOGIN_*_PER_MINUTE settings raised.'
+        )
+
+    return {**percentiles(samples), 'logins': statuses.total()}
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.pollers + args.logins)
+
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30
+    ) as client:
+        email, password = await create_user(client)
+        token = await login(client, email, password)
+
+        report = {
+            'get_todos_idle': await measure(client, token, email, 0, args),
+            'get_todos_during_logins': await measure(
+                client, token, email, args.logins, args
+            ),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'p99 latency of GET /todos while logins run. The login storm '
+            'hammers one account from one address, so run the server with '
+            'high LOGIN_*_BURST and LOGIN_*_PER_MINUTE limits, e.g. '
+            'LOGIN_IP_BURST=1000000 LOGIN_IP_PER_MINUTE=1000000 '
+            'LOGIN_USERNAME_BURST=1000000 LOGIN_USERNAME_PER_MINUTE=1000000.'
+        )
+    )
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--pollers', type=int, default=10)
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=10)
+
+    asyncio.run(main(parser.parse_args()))
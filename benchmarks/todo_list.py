@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+import httpx
+from sqlalchemy import delete, insert, text
+
+from fast_zero.app import app
+from fast_zero.db.connection import AsyncSessionLocal
+from fast_zero.db.models import User
+from fast_zero.helpers.security import create_access_token
+from fast_zero.helpers.settings import env
+from fast_zero.routers.todos import todo_list_cache
+
+SEED_TODOS = text("""
+    INSERT INTO todos
+        (title, description, state, created_at, updated_at, user_id)
+    SELECT
+        'title ' || n,
+        'a somewhat longer description for todo number ' || n,
+        'todo',
+        now(),
+        now(),
+        :user_id
+    FROM generate_series(1, :rows) AS n
+""")
+
+
+async def seed(rows: int) -> int:
+    async with AsyncSessionLocal() as session:
+        user_id = await session.scalar(
+            insert(User)
+            .values(
+                username='list-benchmark',
+                email='list-benchmark@bench.com',
+                password='not-a-hash',
+            )
+            .returning(User.id)
+        )
+        await session.execute(SEED_TODOS, {'user_id': user_id, 'rows': rows})
+        await session.commit()
+
+    return user_id
+
+
+async def cleanup(user_id: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def measure(
+    client: httpx.AsyncClient, mode: str, args: argparse.Namespace
+) -> dict[str, float]:
+    env.LIST_SERIALIZATION = mode
+
+    for _ in range(args.warmup):
+        await client.get('/todos/', params={'limit': args.rows})
+
+    start = perf_counter()
+
+    for _ in range(args.requests):
+        response = await client.get('/todos/', params={'limit': args.rows})
+
+    elapsed = perf_counter() - start
+
+    return {
+        'requests': args.requests,
+        'todos_per_response': len(response.json()['todos']),
+        'requests_per_second': round(args.requests / elapsed, 1),
+        'mean_ms': round(elapsed / args.requests * 1000, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    if env.MAX_PAGE_SIZE < args.rows:
+        raise SystemExit(f'Run with MAX_PAGE_SIZE>={args.rows}')
+
+    if todo_list_cache.ttl > 0:
+        raise SystemExit('Run with TODO_LIST_CACHE_TTL_SECONDS=0')
+
+    user_id = await seed(args.rows)
+    token = create_access_token({
+        'sub': 'list-benchmark@bench.com',
+        'uid': user_id,
+        'ver': 0,
+    })
+
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url='http://bench',
+            headers={'Authorization': f'Bearer {token}'},
+        ) as client:
+            report = {
+                'model': await measure(client, 'model', args),
+                'row': await measure(client, 'row', args),
+            }
+
+        report['speedup'] = round(
+            report['row']['requests_per_second']
+            / report['model']['requests_per_second'],
+            2,
+        )
+
+        print(json.dumps(report, indent=2))
+
+    finally:
+        await cleanup(user_id)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='GET /todos?limit=N throughput per serialization mode.'
+    )
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+
+    asyncio.run(main(parser.parse_args()))
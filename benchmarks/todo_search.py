@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+from time import perf_counter
+
+import httpx
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.app import app
+from fast_zero.db.connection import AsyncSessionLocal
+from fast_zero.db.models import User
+from fast_zero.db.query_stats import query_metrics
+from fast_zero.helpers.security import create_access_token
+from fast_zero.routers.todos import todo_list_cache
+
+TARGET_P99_MS = 20
+
+SEED_TODOS = text("""
+    INSERT INTO todos
+        (title, description, state, created_at, updated_at, user_id)
+    SELECT
+        'word' || (random() * :vocabulary)::int || ' '
+            || 'word' || (random() * :vocabulary)::int,
+        'word' || (random() * :vocabulary)::int || ' '
+            || 'word' || (random() * :vocabulary)::int || ' '
+            || 'word' || (random() * :vocabulary)::int,
+        'todo',
+        now(),
+        now(),
+        :user_id
+    FROM generate_series(1, :rows)
+""")
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+
+    return {
+        'count': len(samples),
+        'p50_ms': round(cuts[49] * 1000, 2),
+        'p95_ms': round(cuts[94] * 1000, 2),
+        'p99_ms': round(cuts[98] * 1000, 2),
+    }
+
+
+async def seed(session: AsyncSession, args: argparse.Namespace) -> int:
+    user_id = await session.scalar(
+        insert(User)
+        .values(
+            username='search-benchmark',
+            email='search-benchmark@bench.com',
+            password='not-a-hash',
+        )
+        .returning(User.id)
+    )
+
+    start = perf_counter()
+    await session.execute(
+        SEED_TODOS,
+        {'vocabulary': args.vocabulary, 'rows': args.rows, 'user_id': user_id},
+    )
+    await session.commit()
+
+    connection = await session.connection(
+        execution_options={'isolation_level': 'AUTOCOMMIT'}
+    )
+    await connection.execute(text('VACUUM ANALYZE todos'))
+    print(f'seeded {args.rows} todos in {perf_counter() - start:.1f}s')
+
+    return user_id
+
+
+async def search(client: httpx.AsyncClient, q: str) -> None:
+    response = await client.get('/todos/', params={'q': q})
+    response.raise_for_status()
+
+
+async def main(args: argparse.Namespace) -> None:
+    if todo_list_cache.ttl > 0:
+        raise SystemExit('Run with TODO_LIST_CACHE_TTL_SECONDS=0')
+
+    async with AsyncSessionLocal() as session:
+        user_id = await seed(session, args)
+
+    token = create_access_token({
+        'sub': 'search-benchmark@bench.com',
+        'uid': user_id,
+        'ver': 0,
+    })
+
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url='http://bench',
+            headers={'Authorization': f'Bearer {token}'},
+        ) as client:
+            for n in range(args.warmup):
+                await search(client, f'word{n}')
+
+            query_metrics.reset()
+            samples = []
+
+            for _ in range(args.queries):
+                q = f'word{random.randint(0, args.vocabulary)}'
+                start = perf_counter()
+                await search(client, q)
+                samples.append(perf_counter() - start)
+
+        report = percentiles(samples)
+        report['rows'] = args.rows
+        report['queries_per_request'] = query_metrics.snapshot()[
+            'GET /todos/'
+        ]['queries_per_request']
+        report['target_p99_ms'] = TARGET_P99_MS
+        report['within_target'] = report['p99_ms'] < TARGET_P99_MS
+
+        print(json.dumps(report, indent=2))
+
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(User).where(User.id == user_id))
+            await session.commit()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='GET /todos?q= search latency on a large todos table.'
+    )
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--vocabulary', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+
+    asyncio.run(main(parser.parse_args()))
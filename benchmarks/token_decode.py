@@ -0,0 +1,51 @@
+import argparse
+import json
+from time import perf_counter
+
+from fast_zero.helpers.tokens import TokenService
+
+
+def decode_throughput(cache_size: int, tokens: int, rounds: int) -> float:
+    service = TokenService(
+        secret_key='benchmark-secret-key',
+        algorithm='HS256',
+        expire_minutes=30,
+        cache_size=cache_size,
+    )
+    encoded = [
+        service.encode({'sub': f'user{n}@bench.com'}) for n in range(tokens)
+    ]
+
+    start = perf_counter()
+
+    for _ in range(rounds):
+        for token in encoded:
+            service.decode(token)
+
+    return tokens * rounds / (perf_counter() - start)
+
+
+def main(args: argparse.Namespace) -> None:
+    without_cache = decode_throughput(0, args.tokens, args.rounds)
+    with_cache = decode_throughput(args.tokens, args.tokens, args.rounds)
+
+    print(
+        json.dumps(
+            {
+                'decodes_per_second_without_cache': round(without_cache),
+                'decodes_per_second_with_cache': round(with_cache),
+                'speedup': round(with_cache / without_cache, 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='JWT decode throughput with and without the token cache.'
+    )
+    parser.add_argument('--tokens', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=500)
+
+    main(parser.parse_args())
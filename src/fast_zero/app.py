@@ -2,14 +2,27 @@ import asyncio
 import sys
 
 from fastapi import FastAPI, status
-
-from fast_zero.routers import auth, todos, users
+from fastapi.responses import ORJSONResponse
+
+from fast_zero.helpers.middleware import (
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    StickyWritesMiddleware,
+)
+from fast_zero.helpers.settings import env
+from fast_zero.routers import admin, auth, metrics, todos, users
 from fast_zero.schemas.schemas import Message
 
 if sys.platform == 'win32':  # pragma: no cover
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    StickyWritesMiddleware,
+    sticky_seconds=env.DATABASE_REPLICA_STICKY_SECONDS,
+)
 
 
 @app.get('/', status_code=status.HTTP_200_OK, response_model=Message)
@@ -20,3 +33,5 @@ async def read_root():
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(todos.router)
+app.include_router(admin.router)
+app.include_router(metrics.router)
@@ -3,9 +3,41 @@ from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from fast_zero.db.pool import InstrumentedPool
+from fast_zero.db.query_stats import instrument_queries
+from fast_zero.db.replicas import ReplicaSet
 from fast_zero.helpers.settings import env
 
-engine = create_async_engine(env.DATABASE_URL)
+engine = create_async_engine(
+    env.DATABASE_URL,
+    poolclass=InstrumentedPool,
+    pool_size=env.DATABASE_POOL_SIZE,
+    max_overflow=env.DATABASE_MAX_OVERFLOW,
+    pool_timeout=env.DATABASE_POOL_TIMEOUT,
+    pool_recycle=env.DATABASE_POOL_RECYCLE,
+    pool_pre_ping=env.DATABASE_POOL_PRE_PING,
+)
+
+replicas = ReplicaSet(
+    primary=engine,
+    replicas=[
+        create_async_engine(
+            url,
+            pool_size=env.DATABASE_POOL_SIZE,
+            max_overflow=env.DATABASE_MAX_OVERFLOW,
+            pool_timeout=env.DATABASE_POOL_TIMEOUT,
+            pool_recycle=env.DATABASE_POOL_RECYCLE,
+            pool_pre_ping=env.DATABASE_POOL_PRE_PING,
+        )
+        for url in env.DATABASE_REPLICA_URLS
+    ],
+    strategy=env.DATABASE_REPLICA_STRATEGY,
+    sticky_seconds=env.DATABASE_REPLICA_STICKY_SECONDS,
+    max_sticky=env.DATABASE_REPLICA_STICKY_MAX_SIZE,
+)
+
+for instrumented_engine in (engine, *replicas.replicas):
+    instrument_queries(instrumented_engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
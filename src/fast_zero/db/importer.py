@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import csv
+import sys
+from datetime import datetime
+from itertools import batched
+from pathlib import Path
+from time import perf_counter
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Literal
+
+import orjson
+from psycopg.errors import IntegrityError
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from fast_zero.db.connection import AsyncSessionLocal
+from fast_zero.helpers.exceptions import BadRequestException
+from fast_zero.helpers.security import pwd_context
+from fast_zero.helpers.settings import env
+from fast_zero.schemas.schemas import TodoImport, UserImport
+
+ImportTarget = Literal['todos', 'users']
+ImportFormat = Literal['csv', 'ndjson']
+
+COPY_STATEMENTS = {
+    'todos': (
+        'COPY todos (title, description, state, user_id, created_at, '
+        'updated_at) FROM STDIN'
+    ),
+    'users': (
+        'COPY users (username, email, password, created_at, updated_at) '
+        'FROM STDIN'
+    ),
+}
+
+
+def read_records(file: BinaryIO, format: ImportFormat) -> Iterator[dict]:
+    lines = (line.decode('utf-8') for line in file)
+    records = (
+        csv.DictReader(lines)
+        if format == 'csv'
+        else (orjson.loads(line) for line in lines if line.strip())
+    )
+    number = 1
+
+    try:
+        for record in records:
+            yield record
+            number += 1
+
+    except (csv.Error, ValueError) as error:
+        raise BadRequestException(detail=f'Row {number}: {error}')
+
+
+def todo_row(record: dict, now: datetime) -> tuple:
+    todo = TodoImport.model_validate(record)
+
+    return (
+        todo.title,
+        todo.description,
+        todo.state.value,
+        todo.user_id,
+        now,
+        now,
+    )
+
+
+def user_row(record: dict, now: datetime) -> tuple:
+    user = UserImport.model_validate(record)
+
+    if not any(
+        hasher.identify(user.password) for hasher in pwd_context.hashers
+    ):
+        raise ValueError('password must be a supported password hash')
+
+    return user.username, user.email, user.password, now, now
+
+
+ROW_BUILDERS: dict[str, Callable[[dict, datetime], tuple]] = {
+    'todos': todo_row,
+    'users': user_row,
+}
+
+
+def build_rows(
+    target: ImportTarget, records: Iterable[dict], now: datetime, first: int
+) -> list[tuple]:
+    build_row = ROW_BUILDERS[target]
+    rows = []
+
+    for number, record in enumerate(records, start=first):
+        try:
+            rows.append(build_row(record, now))
+
+        except (ValidationError, ValueError) as error:
+            message = (
+                error.errors()[0]['msg']
+                if isinstance(error, ValidationError)
+                else str(error)
+            )
+            raise BadRequestException(detail=f'Row {number}: {message}')
+
+    return rows
+
+
+async def copy_rows(
+    session: AsyncSession, target: ImportTarget, rows: list[tuple], first: int
+) -> None:
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+
+    try:
+        async with (
+            raw_connection.driver_connection.cursor() as cursor,
+            cursor.copy(COPY_STATEMENTS[target]) as copy,
+        ):
+            for row in rows:
+                await copy.write_row(row)
+
+    except IntegrityError as error:
+        await session.rollback()
+        raise BadRequestException(
+            detail=(
+                f'Rows {first}-{first + len(rows) - 1}: '
+                f'{error.diag.message_primary}'
+            )
+        )
+
+
+async def import_records(
+    session: AsyncSession,
+    target: ImportTarget,
+    records: Iterable[dict],
+    chunk_size: int,
+    progress: Callable[[int], Any] | None = None,
+) -> int:
+    now = await session.scalar(select(func.localtimestamp()))
+    imported = 0
+
+    try:
+        for chunk in batched(records, chunk_size):
+            rows = build_rows(target, chunk, now, imported + 1)
+            await copy_rows(session, target, rows, imported + 1)
+            await session.commit()
+            imported += len(rows)
+
+            if progress:
+                progress(imported)
+
+    except BadRequestException as error:
+        raise BadRequestException(
+            detail=f'{error.detail} ({imported} rows already imported)'
+        )
+
+    return imported
+
+
+async def main(args: argparse.Namespace) -> None:
+    format = args.format or args.path.suffix.removeprefix('.')
+    start = perf_counter()
+
+    def report(rows: int) -> None:
+        rate = rows / (perf_counter() - start)
+        print(f'{rows} rows ({rate:.0f} rows/s)', file=sys.stderr)
+
+    with args.path.open('rb') as file:
+        async with AsyncSessionLocal() as session:
+            try:
+                rows = await import_records(
+                    session,
+                    args.target,
+                    read_records(file, format),
+                    args.chunk_size,
+                    report,
+                )
+
+            except BadRequestException as error:
+                raise SystemExit(error.detail)
+
+    print(f'imported {rows} {args.target} in {perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Bulk load todos or users with COPY FROM STDIN.'
+    )
+    parser.add_argument('target', choices=['todos', 'users'])
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--format', choices=['csv', 'ndjson'])
+    parser.add_argument(
+        '--chunk-size', type=int, default=env.IMPORT_CHUNK_SIZE
+    )
+
+    asyncio.run(main(parser.parse_args()))
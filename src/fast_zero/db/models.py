@@ -1,9 +1,12 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import DDL, Column, Computed, ForeignKey, Index, event, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
 
+from fast_zero.helpers.settings import env
+
 
 class TodoState(str, Enum):
     draft = 'draft'
@@ -15,15 +18,25 @@ class TodoState(str, Enum):
 
 table_registry = registry()
 
+event.listen(
+    table_registry.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'),
+)
+
 
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
+    __mapper_args__ = {'eager_defaults': True}
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     username: Mapped[str] = mapped_column(unique=True)
     email: Mapped[str] = mapped_column(unique=True)
     password: Mapped[str]
+    token_version: Mapped[int] = mapped_column(
+        init=False, default=0, server_default='0'
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         init=False, default=func.now()
@@ -33,13 +46,33 @@ class User:
     )
 
     todos: Mapped[list['Todo']] = relationship(
-        init=False, cascade='all, delete-orphan', lazy='selectin'
+        init=False,
+        cascade='all, delete-orphan',
+        passive_deletes=True,
+        lazy=env.USER_TODOS_LOADING,
     )
 
 
 @table_registry.mapped_as_dataclass
 class Todo:
     __tablename__ = 'todos'
+    __mapper_args__ = {'eager_defaults': True}
+    __table_args__ = (
+        Index('ix_todos_user_id_state_id', 'user_id', 'state', 'id'),
+        Index('ix_todos_user_id_id', 'user_id', 'id'),
+        Index(
+            'ix_todos_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_todos_description_trgm',
+            'description',
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
@@ -53,4 +86,20 @@ class Todo:
         init=False, default=func.now(), onupdate=func.now()
     )
 
-    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE')
+    )
+
+
+todo_search_vector = Column(
+    'search_vector',
+    TSVECTOR,
+    Computed(
+        "to_tsvector('english', title || ' ' || description)",
+        persisted=True,
+    ),
+)
+
+Todo.__table__.append_column(todo_search_vector)
+
+Index('ix_todos_search_vector', todo_search_vector, postgresql_using='gin')
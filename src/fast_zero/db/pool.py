@@ -0,0 +1,59 @@
+from time import perf_counter
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checked_out = 0
+        self.overflow = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            'checked_out': self.checked_out,
+            'overflow': self.overflow,
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'wait_seconds_total': self.wait_seconds_total,
+            'wait_seconds_max': self.wait_seconds_max,
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        start = perf_counter()
+
+        try:
+            connection = super()._do_get()
+
+        except TimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+
+        finally:
+            pool_metrics.observe_wait(perf_counter() - start)
+
+        pool_metrics.checkouts += 1
+        self._update_gauges()
+
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        pool_metrics.checked_out = self.checkedout()
+        pool_metrics.overflow = max(self.overflow(), 0)
@@ -0,0 +1,102 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def observe(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+@dataclass
+class RouteQueryStats:
+    requests: int = 0
+    queries: int = 0
+    seconds: float = 0.0
+    max_queries: int = 0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+
+class QueryMetrics:
+    def __init__(self) -> None:
+        self.routes: dict[str, RouteQueryStats] = {}
+
+    def observe(self, route: str, stats: QueryStats) -> None:
+        route_stats = self.routes.get(route)
+
+        if route_stats is None:
+            route_stats = self.routes[route] = RouteQueryStats()
+
+        route_stats.requests += 1
+        route_stats.queries += stats.count
+        route_stats.seconds += stats.seconds
+        route_stats.max_queries = max(route_stats.max_queries, stats.count)
+
+        if stats.slowest_seconds >= route_stats.slowest_seconds:
+            route_stats.slowest_seconds = stats.slowest_seconds
+            route_stats.slowest_statement = stats.slowest_statement
+
+    def reset(self) -> None:
+        self.routes.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        return {
+            route: {
+                'requests': stats.requests,
+                'queries': stats.queries,
+                'queries_per_request': stats.queries / stats.requests,
+                'seconds': stats.seconds,
+                'max_queries': stats.max_queries,
+                'slowest_seconds': stats.slowest_seconds,
+                'slowest_statement': stats.slowest_statement,
+            }
+            for route, stats in self.routes.items()
+        }
+
+
+query_metrics = QueryMetrics()
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    'current_query_stats', default=None
+)
+
+
+def _before_cursor_execute(context, **kw):
+    context.query_start = perf_counter()
+
+
+def _after_cursor_execute(context, statement, **kw):
+    stats = current_query_stats.get()
+
+    if stats is not None:
+        stats.observe(statement, perf_counter() - context.query_start)
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    event.listen(
+        engine.sync_engine,
+        'before_cursor_execute',
+        _before_cursor_execute,
+        named=True,
+    )
+    event.listen(
+        engine.sync_engine,
+        'after_cursor_execute',
+        _after_cursor_execute,
+        named=True,
+    )
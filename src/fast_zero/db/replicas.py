@@ -0,0 +1,54 @@
+from contextvars import ContextVar
+from itertools import count
+from typing import Literal
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from fast_zero.helpers.cache import TTLCache
+
+STICKY_COOKIE = 'read_primary'
+
+request_writes: ContextVar[list[int] | None] = ContextVar(
+    'request_writes', default=None
+)
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        strategy: Literal['round_robin', 'least_busy'],
+        sticky_seconds: float,
+        max_sticky: int,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self.writers = TTLCache(max_size=max_sticky, ttl=sticky_seconds)
+        self._turn = count()
+
+    def stick(self, user_id: int) -> None:
+        self.writers.set(user_id, True)
+        writes = request_writes.get()
+
+        if writes is not None:
+            writes.append(user_id)
+
+    def pick(
+        self, user_id: int | None = None, sticky: bool = False
+    ) -> AsyncEngine:
+        if not self.replicas or sticky:
+            return self.primary
+
+        if user_id is not None and self.writers.get(user_id, False):
+            return self.primary
+
+        offset = next(self._turn) % len(self.replicas)
+        replicas = self.replicas[offset:] + self.replicas[:offset]
+
+        if self.strategy == 'least_busy':
+            return min(replicas, key=lambda replica: replica.pool.checkedout())
+
+        return replicas[0]
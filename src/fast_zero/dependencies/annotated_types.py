@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Callable
 
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordRequestForm
@@ -6,8 +6,25 @@ from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from fast_zero.db.connection import get_session
 from fast_zero.db.models import User
-from fast_zero.helpers.security import get_current_user
+from fast_zero.dependencies.database import (
+    get_read_session,
+    get_read_sessionmaker,
+)
+from fast_zero.helpers.security import (
+    Principal,
+    get_admin_user,
+    get_current_principal,
+    get_current_user,
+    get_token_principal,
+)
 
 T_Session = Annotated[AsyncSession, Depends(get_session)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+T_ReadSessionMaker = Annotated[
+    Callable[[], AsyncSession], Depends(get_read_sessionmaker)
+]
 T_OAuthForm = Annotated[OAuth2PasswordRequestForm, Depends()]
 T_CurrentUser = Annotated[User, Depends(get_current_user)]
+T_Principal = Annotated[Principal, Depends(get_current_principal)]
+T_TokenPrincipal = Annotated[Principal, Depends(get_token_principal)]
+T_AdminUser = Annotated[User, Depends(get_admin_user)]
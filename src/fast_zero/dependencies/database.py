@@ -0,0 +1,40 @@
+from functools import partial
+from typing import Annotated, AsyncGenerator, Callable
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from fast_zero.db.connection import AsyncSessionLocal, get_session, replicas
+from fast_zero.db.replicas import STICKY_COOKIE
+from fast_zero.helpers.security import Principal, get_current_principal
+
+
+def pick_read_engine(request: Request, principal: Principal) -> AsyncEngine:
+    return replicas.pick(principal.id, sticky=STICKY_COOKIE in request.cookies)
+
+
+async def get_read_session(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    principal: Annotated[Principal, Depends(get_current_principal)],
+) -> AsyncGenerator[AsyncSession, None]:
+    engine = pick_read_engine(request, principal)
+
+    if engine is replicas.primary:
+        yield session
+        return
+
+    async with AsyncSessionLocal(
+        bind=engine
+    ) as replica_session:  # pragma: no cover
+        yield replica_session
+
+
+def get_read_sessionmaker(
+    request: Request,
+    principal: Annotated[Principal, Depends(get_current_principal)],
+) -> Callable[[], AsyncSession]:
+    return partial(
+        AsyncSessionLocal, bind=pick_read_engine(request, principal)
+    )
@@ -0,0 +1,85 @@
+import argparse
+import json
+from statistics import median
+from time import perf_counter
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from fast_zero.helpers.settings import env
+
+MIN_MEMORY_COST = 8 * 1024
+MAX_TIME_COST = 20
+
+
+def hash_seconds(hasher: Argon2Hasher, samples: int) -> float:
+    timings = []
+
+    for _ in range(samples):
+        start = perf_counter()
+        hasher.hash('calibration-password')
+        timings.append(perf_counter() - start)
+
+    return median(timings)
+
+
+def calibrate(
+    target_seconds: float, memory_cost: int, parallelism: int, samples: int
+) -> dict[str, float]:
+    time_cost = 1
+
+    while True:
+        hasher = Argon2Hasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+        )
+        seconds = hash_seconds(hasher, samples)
+
+        if seconds > target_seconds and time_cost == 1:
+            if memory_cost // 2 < MIN_MEMORY_COST:
+                break
+
+            memory_cost //= 2
+            continue
+
+        if seconds * (time_cost + 1) / time_cost > target_seconds:
+            break
+
+        if time_cost >= MAX_TIME_COST:
+            break
+
+        time_cost += 1
+
+    return {
+        'ARGON2_TIME_COST': time_cost,
+        'ARGON2_MEMORY_COST': memory_cost,
+        'ARGON2_PARALLELISM': parallelism,
+        'hash_ms': round(seconds * 1000, 1),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Pick argon2 parameters that hash in about --target-ms.'
+    )
+    parser.add_argument('--target-ms', type=float, default=250)
+    parser.add_argument(
+        '--memory-cost', type=int, default=env.ARGON2_MEMORY_COST
+    )
+    parser.add_argument(
+        '--parallelism', type=int, default=env.ARGON2_PARALLELISM
+    )
+    parser.add_argument('--samples', type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            calibrate(
+                args.target_ms / 1000,
+                args.memory_cost,
+                args.parallelism,
+                args.samples,
+            ),
+            indent=2,
+        )
+    )
@@ -0,0 +1,48 @@
+from hashlib import blake2b
+from typing import Any
+
+from fastapi import Request, Response, status
+from sqlalchemy import Select, func
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def make_etag(*parts: Any) -> str:
+    digest = blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get('if-none-match')
+
+    if not header:
+        return False
+
+    if header.strip() == '*':
+        return True
+
+    tags = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+
+    return etag.removeprefix('W/') in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+    )
+
+
+async def query_etag(
+    session: AsyncSession,
+    query: Select,
+    updated_at: InstrumentedAttribute,
+    *parts: Any,
+) -> str:
+    result = await session.execute(
+        query.with_only_columns(
+            func.count(), func.max(updated_at), maintain_column_froms=True
+        )
+    )
+
+    return make_etag(*parts, *result.one())
@@ -31,3 +31,33 @@ class NotFoundException(HTTPException):
         headers: dict[str, str] | None = None,
     ) -> None:
         super().__init__(status_code, detail, headers)
+
+
+class BadRequestException(HTTPException):
+    def __init__(
+        self,
+        status_code: int = status.HTTP_400_BAD_REQUEST,
+        detail: Any = 'Bad request',
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(status_code, detail, headers)
+
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(
+        self,
+        status_code: int = status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail: Any = 'Service unavailable',
+        headers: dict[str, str] | None = {'Retry-After': '1'},
+    ) -> None:
+        super().__init__(status_code, detail, headers)
+
+
+class TooManyRequestsException(HTTPException):
+    def __init__(
+        self,
+        status_code: int = status.HTTP_429_TOO_MANY_REQUESTS,
+        detail: Any = 'Too many requests',
+        headers: dict[str, str] | None = {'Retry-After': '1'},
+    ) -> None:
+        super().__init__(status_code, detail, headers)
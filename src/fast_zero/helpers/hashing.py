@@ -0,0 +1,56 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, TypeVar
+
+from fast_zero.helpers.exceptions import ServiceUnavailableException
+from fast_zero.helpers.metrics import Histogram
+
+T = TypeVar('T')
+
+
+def timed(func: Callable[..., T], *args: Any) -> tuple[T, float]:
+    start = perf_counter()
+    result = func(*args)
+
+    return result, perf_counter() - start
+
+
+class HashWorkerPool:
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.durations = Histogram()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='password-hash',
+        )
+
+    @property
+    def saturated(self) -> bool:
+        return self.pending >= self.max_pending
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.saturated:
+            raise ServiceUnavailableException(
+                detail='Too many pending password operations'
+            )
+
+        self.pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            result, seconds = await loop.run_in_executor(
+                self.executor, timed, func, *args
+            )
+
+        finally:
+            self.pending -= 1
+
+        self.durations.observe(seconds)
+
+        return result
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,134 @@
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+POOL_GAUGES = {'checked_out', 'overflow', 'wait_seconds_max'}
+
+
+def format_labels(**labels: str) -> str:
+    return ','.join(f'{name}="{value}"' for name, value in labels.items())
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str = '') -> list[str]:
+        prefix = f'{labels},' if labels else ''
+        lines = []
+        cumulative = 0
+
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+
+        suffix = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {self.sum}')
+        lines.append(f'{name}_count{suffix} {self.count}')
+
+        return lines
+
+
+class RouteMetrics:
+    def __init__(self, method: str, route: str) -> None:
+        self.labels = format_labels(method=method, route=route)
+        self.latency = Histogram()
+        self.statuses: dict[int, int] = {}
+
+    def observe(self, status_code: int, seconds: float) -> None:
+        self.latency.observe(seconds)
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+
+
+class HTTPMetrics:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.routes: dict[str, dict[str, RouteMetrics]] = {}
+
+    def for_route(self, method: str, route: str) -> RouteMetrics:
+        methods = self.routes.get(route)
+
+        if methods is None:
+            methods = self.routes[route] = {}
+
+        metrics = methods.get(method)
+
+        if metrics is None:
+            metrics = methods[method] = RouteMetrics(method, route)
+
+        return metrics
+
+    def all_routes(self) -> list[RouteMetrics]:
+        return [
+            metrics
+            for methods in self.routes.values()
+            for metrics in methods.values()
+        ]
+
+
+http_metrics = HTTPMetrics()
+
+
+def render_metrics(pool: dict[str, float], password_hash: Histogram) -> str:
+    routes = http_metrics.all_routes()
+    lines = [
+        '# HELP http_request_duration_seconds Request latency by route.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+
+    for route in routes:
+        lines.extend(
+            route.latency.render('http_request_duration_seconds', route.labels)
+        )
+
+    lines.extend([
+        '# HELP http_responses_total Responses by route and status code.',
+        '# TYPE http_responses_total counter',
+    ])
+
+    for route in routes:
+        lines.extend(
+            f'http_responses_total{{{route.labels},status="{status}"}} {count}'
+            for status, count in sorted(route.statuses.items())
+        )
+
+    lines.extend([
+        '# HELP http_requests_in_flight Requests being served.',
+        '# TYPE http_requests_in_flight gauge',
+        f'http_requests_in_flight {http_metrics.in_flight}',
+    ])
+
+    for name, value in pool.items():
+        kind = 'gauge' if name in POOL_GAUGES else 'counter'
+        lines.extend([
+            f'# TYPE db_pool_{name} {kind}',
+            f'db_pool_{name} {value}',
+        ])
+
+    lines.extend([
+        '# HELP password_hash_duration_seconds Argon2 hash and verify time.',
+        '# TYPE password_hash_duration_seconds histogram',
+        *password_hash.render('password_hash_duration_seconds'),
+    ])
+
+    return '\n'.join(lines) + '\n'
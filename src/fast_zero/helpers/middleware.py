@@ -0,0 +1,125 @@
+from math import ceil
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fast_zero.db.query_stats import (
+    QueryStats,
+    current_query_stats,
+    query_metrics,
+)
+from fast_zero.db.replicas import STICKY_COOKIE, request_writes
+from fast_zero.helpers.metrics import http_metrics
+
+
+def route_labels(scope: Scope) -> tuple[str, str]:
+    route = scope.get('route')
+
+    if route is None:
+        return 'OTHER', 'unmatched'
+
+    method = scope['method']
+
+    if method not in getattr(route, 'methods', ()):
+        method = 'OTHER'
+
+    return method, route.path
+
+
+def server_timing(stats: QueryStats) -> str:
+    return (
+        f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", '
+        f'db-slowest;dur={stats.slowest_seconds * 1000:.2f}'
+    )
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(scope=message)
+                headers.append('Server-Timing', server_timing(stats))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+
+        finally:
+            current_query_stats.reset(token)
+
+            if scope.get('route') is not None:
+                query_metrics.observe(' '.join(route_labels(scope)), stats)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+
+            await send(message)
+
+        http_metrics.in_flight += 1
+        start = perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+
+        finally:
+            http_metrics.in_flight -= 1
+            http_metrics.for_route(*route_labels(scope)).observe(
+                status_code, perf_counter() - start
+            )
+
+
+class StickyWritesMiddleware:
+    def __init__(self, app: ASGIApp, sticky_seconds: float) -> None:
+        self.app = app
+        self.cookie = (
+            f'{STICKY_COOKIE}=1; Max-Age={ceil(sticky_seconds)}; Path=/; '
+            'HttpOnly; SameSite=lax'
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        writes = []
+        token = request_writes.set(writes)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message['type'] == 'http.response.start' and writes:
+                headers = MutableHeaders(scope=message)
+                headers.append('Set-Cookie', self.cookie)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+
+        finally:
+            request_writes.reset(token)
@@ -0,0 +1,44 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Sequence, TypeVar
+
+from sqlalchemy import Select
+from sqlalchemy.orm import InstrumentedAttribute
+
+from fast_zero.helpers.exceptions import BadRequestException
+from fast_zero.schemas.schemas import FilterPage
+
+T = TypeVar('T')
+
+
+def encode_cursor(value: int) -> str:
+    return urlsafe_b64encode(str(value).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(urlsafe_b64decode(cursor.encode()).decode())
+
+    except ValueError:
+        raise BadRequestException(detail='Invalid cursor')
+
+
+def paginate(
+    query: Select, column: InstrumentedAttribute[int], page: FilterPage
+) -> Select:
+    if page.cursor:
+        query = query.where(column > decode_cursor(page.cursor))
+    else:
+        query = query.offset(page.offset)
+
+    return query.order_by(column).limit(page.limit + 1)
+
+
+def next_page(
+    rows: Sequence[T], column: InstrumentedAttribute[int], page: FilterPage
+) -> tuple[Sequence[T], str | None]:
+    if len(rows) <= page.limit:
+        return rows, None
+
+    rows = rows[: page.limit]
+
+    return rows, encode_cursor(getattr(rows[-1], column.key))
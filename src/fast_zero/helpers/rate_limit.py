@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from math import ceil
+from time import monotonic
+from typing import Protocol
+
+from fast_zero.helpers.exceptions import TooManyRequestsException
+
+
+class RateLimitBackend(Protocol):
+    async def take(self, key: str, capacity: float, rate: float) -> float: ...
+
+
+class MemoryRateLimitBackend:
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        now = monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return retry_after
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        name: str,
+        capacity: float,
+        per_minute: float,
+    ) -> None:
+        self.backend = backend
+        self.name = name
+        self.capacity = capacity
+        self.rate = per_minute / 60
+
+    async def check(self, key: str) -> None:
+        retry_after = await self.backend.take(
+            f'{self.name}:{key}', self.capacity, self.rate
+        )
+
+        if retry_after:
+            raise TooManyRequestsException(
+                headers={'Retry-After': str(ceil(retry_after))}
+            )
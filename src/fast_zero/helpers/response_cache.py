@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Protocol
+from uuid import uuid4
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class MemoryBackend:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._data.get(key)
+
+        if entry is None:
+            return None
+
+        if entry[0] <= monotonic():
+            self._pop(key)
+            return None
+
+        self._data.move_to_end(key)
+
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        size = len(key) + len(value)
+
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        self._pop(key)
+        self._data[key] = (monotonic() + ttl, value)
+        self.size_bytes += size
+
+        while self.size_bytes > self.max_bytes:
+            self._pop(next(iter(self._data)))
+
+    async def delete(self, key: str) -> None:
+        self._pop(key)
+
+    def _pop(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+
+        if entry is not None:
+            self.size_bytes -= len(key) + len(entry[1])
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str
+    body: bytes
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, name: str, ttl: float) -> None:
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._namespace = uuid4().hex
+
+    def _generation_key(self, scope: int) -> str:
+        return f'{self.name}:{self._namespace}:{scope}'
+
+    async def get(
+        self, scope: int, key: str
+    ) -> tuple[str, CachedResponse | None]:
+        generation_key = self._generation_key(scope)
+        generation = await self.backend.get(generation_key)
+
+        if generation is None:
+            generation = uuid4().hex.encode()
+            await self.backend.set(generation_key, generation, self.ttl)
+
+        generation = generation.decode()
+        value = await self.backend.get(f'{generation_key}:{generation}:{key}')
+
+        if value is None:
+            self.misses += 1
+            return generation, None
+
+        self.hits += 1
+        etag, _, body = value.partition(b'\n')
+
+        return generation, CachedResponse(etag.decode(), body)
+
+    async def set(
+        self,
+        scope: int,
+        generation: str,
+        key: str,
+        response: CachedResponse,
+    ) -> None:
+        await self.backend.set(
+            f'{self._generation_key(scope)}:{generation}:{key}',
+            response.etag.encode() + b'\n' + response.body,
+            self.ttl,
+        )
+
+    async def invalidate(self, scope: int) -> None:
+        await self.backend.delete(self._generation_key(scope))
+
+    def clear(self) -> None:
+        self._namespace = uuid4().hex
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
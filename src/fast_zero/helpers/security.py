@@ -1,54 +1,139 @@
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from dataclasses import dataclass
 
 import jwt
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from pwdlib import PasswordHash
-from sqlalchemy import select
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy import inspect, select, update
 from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
-from fast_zero.db.connection import get_session
+from fast_zero.db.connection import AsyncSessionLocal, get_session
 from fast_zero.db.models import User
-from fast_zero.helpers.exceptions import CredentialsException
+from fast_zero.helpers.cache import TTLCache
+from fast_zero.helpers.exceptions import (
+    CredentialsException,
+    PermissionException,
+    ServiceUnavailableException,
+)
+from fast_zero.helpers.hashing import HashWorkerPool
 from fast_zero.helpers.settings import env
+from fast_zero.helpers.tokens import TokenService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/token')
 
-pwd_context = PasswordHash.recommended()
+pwd_context = PasswordHash((
+    Argon2Hasher(
+        time_cost=env.ARGON2_TIME_COST,
+        memory_cost=env.ARGON2_MEMORY_COST,
+        parallelism=env.ARGON2_PARALLELISM,
+    ),
+))
 
+hash_pool = HashWorkerPool(
+    max_workers=env.PASSWORD_HASH_WORKERS,
+    max_pending=env.PASSWORD_HASH_MAX_PENDING,
+)
 
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
+token_service = TokenService(
+    secret_key=env.SECRET_KEY,
+    algorithm=env.ALGORITHM,
+    expire_minutes=env.ACCESS_TOKEN_EXPIRE_MINUTES,
+    cache_size=env.TOKEN_CACHE_MAX_SIZE,
+)
 
+user_cache = TTLCache(
+    max_size=env.USER_CACHE_MAX_SIZE,
+    ttl=env.USER_CACHE_TTL_SECONDS,
+)
 
-def verify_password(pain_password: str, hashed_password: str):
-    return pwd_context.verify(pain_password, hashed_password)
+principal_cache = TTLCache(
+    max_size=env.USER_CACHE_MAX_SIZE,
+    ttl=env.USER_CACHE_TTL_SECONDS,
+)
 
 
-def create_access_token(data: dict):
-    to_encode = data.copy()
+user_columns = [column.key for column in inspect(User).column_attrs]
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    token_version: int
+
+
+async def get_password_hash(password: str):
+    return await hash_pool.run(pwd_context.hash, password)
 
-    expire_time = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
-        minutes=env.ACCESS_TOKEN_EXPIRE_MINUTES
+
+async def verify_password(pain_password: str, hashed_password: str):
+    return await hash_pool.run(
+        pwd_context.verify, pain_password, hashed_password
     )
 
-    to_encode.update({'exp': expire_time})
 
-    encoded_jwt = jwt.encode(to_encode, env.SECRET_KEY, env.ALGORITHM)
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.current_hasher.check_needs_rehash(hashed_password)
 
-    return encoded_jwt
 
+async def rehash_password(user_id: int, password: str, hashed_password: str):
+    try:
+        new_hash = await get_password_hash(password)
 
-async def get_current_user(
-    session: AsyncSession = Depends(get_session),
-    token: str = Depends(oauth2_scheme),
-):
+    except ServiceUnavailableException:
+        return
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(User)
+            .where(User.id == user_id, User.password == hashed_password)
+            .values(password=new_hash)
+        )
+        await session.commit()
+
+    invalidate_user(user_id)
+
+
+def create_access_token(data: dict):
+    return token_service.encode(data)
+
+
+def create_user_access_token(user: User):
+    return create_access_token({
+        'sub': user.email,
+        'uid': user.id,
+        'ver': user.token_version,
+    })
+
+
+def snapshot_user(user: User) -> dict:
+    return {key: getattr(user, key) for key in user_columns}
+
+
+def restore_user(values: dict) -> User:
+    user = inspect(User).class_manager.new_instance()
+
+    for key, value in values.items():
+        setattr(user, key, value)
+
+    make_transient_to_detached(user)
+
+    return user
+
+
+def invalidate_user(user_id: int):
+    user_cache.delete(user_id)
+    principal_cache.delete(user_id)
+
+
+def read_token(token: str) -> Principal:
     try:
-        payload: dict = jwt.decode(token, env.SECRET_KEY, env.ALGORITHM)
-        sub_email = payload.get('sub')
+        payload: dict = token_service.decode(token)
+        user_id = payload.get('uid')
+        token_version = payload.get('ver')
 
-        if not sub_email:
+        if not isinstance(user_id, int) or not isinstance(token_version, int):
             raise CredentialsException()
 
     except jwt.DecodeError:
@@ -57,9 +142,73 @@ async def get_current_user(
     except jwt.ExpiredSignatureError:
         raise CredentialsException(detail='Token has expired')
 
-    user = await session.scalar(select(User).where(User.email == sub_email))
+    return Principal(id=user_id, token_version=token_version)
+
+
+async def get_current_principal(
+    session: AsyncSession = Depends(get_session),
+    token: str = Depends(oauth2_scheme),
+):
+    principal = read_token(token)
+    token_version = principal_cache.get(principal.id)
+
+    if token_version is None:
+        token_version = await session.scalar(
+            select(User.token_version).where(User.id == principal.id)
+        )
+        await session.commit()
+
+        if token_version is None:
+            raise CredentialsException()
+
+        principal_cache.set(principal.id, token_version)
+
+    if token_version != principal.token_version:
+        raise CredentialsException()
+
+    return principal
+
+
+async def get_token_principal(token: str = Depends(oauth2_scheme)):
+    return read_token(token)
+
+
+async def get_verified_user(
+    session: AsyncSession = Depends(get_session),
+    token: str = Depends(oauth2_scheme),
+):
+    principal = read_token(token)
+    user = await session.get(User, principal.id, populate_existing=True)
+
+    if not user or user.token_version != principal.token_version:
+        raise CredentialsException()
+
+    return user
+
+
+async def get_admin_user(user: User = Depends(get_verified_user)):
+    if user.email not in env.ADMIN_EMAILS:
+        raise PermissionException()
+
+    return user
+
+
+async def get_current_user(
+    session: AsyncSession = Depends(get_session),
+    token: str = Depends(oauth2_scheme),
+):
+    principal = read_token(token)
+    cached_user = user_cache.get(principal.id)
+
+    if cached_user:
+        user = await session.merge(restore_user(cached_user), load=False)
+    else:
+        user = await session.get(User, principal.id)
+
+        if user:
+            user_cache.set(principal.id, snapshot_user(user))
 
-    if not user:
+    if not user or user.token_version != principal.token_version:
         raise CredentialsException()
 
     return user
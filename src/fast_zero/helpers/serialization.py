@@ -0,0 +1,35 @@
+from typing import Any, Sequence
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Row
+from sqlalchemy.orm import InstrumentedAttribute
+
+from fast_zero.helpers.settings import env
+
+
+def public_columns(
+    model: type, schema: type[BaseModel]
+) -> list[InstrumentedAttribute]:
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def list_response(
+    response: Response,
+    key: str,
+    rows: Sequence[Row],
+    next_cursor: str | None = None,
+) -> Any:
+    if env.LIST_SERIALIZATION == 'model':
+        return {key: rows, 'next_cursor': next_cursor}
+
+    return ORJSONResponse(
+        {key: [row._asdict() for row in rows], 'next_cursor': next_cursor},
+        headers=response.headers,
+    )
+
+
+def ndjson_rows(rows: Sequence[Row]) -> bytes:
+    return b''.join(orjson.dumps(row._asdict()) + b'\n' for row in rows)
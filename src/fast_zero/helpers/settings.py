@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,5 +15,55 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_STRATEGY: Literal['round_robin', 'least_busy'] = (
+        'round_robin'
+    )
+    DATABASE_REPLICA_STICKY_SECONDS: float = 5
+    DATABASE_REPLICA_STICKY_MAX_SIZE: int = 10_000
+
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 60
+
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    LOGIN_IP_BURST: int = 30
+    LOGIN_IP_PER_MINUTE: float = 30
+    LOGIN_USERNAME_BURST: int = 5
+    LOGIN_USERNAME_PER_MINUTE: float = 5
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    MAX_PAGE_SIZE: int = 100
+    EXPORT_BATCH_SIZE: int = 1000
+    MAX_BATCH_SIZE: int = 500
+    LIST_SERIALIZATION: Literal['model', 'row'] = 'row'
+
+    ADMIN_EMAILS: list[str] = []
+    IMPORT_CHUNK_SIZE: int = 10_000
+    IMPORT_SPOOL_MAX_BYTES: int = 8 * 1024 * 1024
+
+    TODO_STATS_CACHE_MAX_SIZE: int = 1024
+    TODO_STATS_CACHE_TTL_SECONDS: float = 5
+
+    TODO_LIST_CACHE_TTL_SECONDS: float = 5
+    TODO_LIST_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+
+    USER_TODOS_LOADING: Literal['noload', 'raise', 'select', 'selectin'] = (
+        'noload'
+    )
+
 
 env = Settings()
@@ -0,0 +1,41 @@
+from datetime import UTC, datetime, timedelta
+from time import time
+
+import jwt
+
+from fast_zero.helpers.cache import TTLCache
+
+
+class TokenService:
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str,
+        expire_minutes: int,
+        cache_size: int,
+    ) -> None:
+        self.algorithm = algorithm
+        self.algorithms = [algorithm]
+        self.expire_delta = timedelta(minutes=expire_minutes)
+        self.key = jwt.get_algorithm_by_name(algorithm).prepare_key(secret_key)
+        self.cache = TTLCache(max_size=cache_size, ttl=0)
+
+    def encode(self, data: dict) -> str:
+        to_encode = data.copy()
+        to_encode.update({'exp': datetime.now(tz=UTC) + self.expire_delta})
+
+        return jwt.encode(to_encode, self.key, self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        claims = self.cache.get(token)
+
+        if claims is not None:
+            return claims
+
+        claims = jwt.decode(token, self.key, algorithms=self.algorithms)
+        ttl = claims.get('exp', 0) - time()
+
+        if ttl > 0:
+            self.cache.set(token, claims, ttl=ttl)
+
+        return claims
@@ -0,0 +1,53 @@
+from tempfile import SpooledTemporaryFile
+
+from fastapi import APIRouter, Request, status
+
+from fast_zero.db.importer import (
+    ImportFormat,
+    ImportTarget,
+    import_records,
+    read_records,
+)
+from fast_zero.dependencies.annotated_types import T_AdminUser, T_Session
+from fast_zero.helpers.settings import env
+from fast_zero.routers.todos import (
+    stats_cache,
+    stats_generations,
+    todo_list_cache,
+)
+from fast_zero.schemas.schemas import ImportResult
+
+router = APIRouter(prefix='/admin', tags=['admin'])
+
+
+@router.post(
+    '/import/{target}',
+    status_code=status.HTTP_201_CREATED,
+    response_model=ImportResult,
+)
+async def import_data(
+    target: ImportTarget,
+    request: Request,
+    session: T_Session,
+    _: T_AdminUser,
+    format: ImportFormat = 'csv',
+):
+    with SpooledTemporaryFile(max_size=env.IMPORT_SPOOL_MAX_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+
+        spool.seek(0)
+
+        rows = await import_records(
+            session,
+            target,
+            read_records(spool, format),
+            env.IMPORT_CHUNK_SIZE,
+        )
+
+    if target == 'todos':
+        stats_cache.clear()
+        stats_generations.clear()
+        todo_list_cache.clear()
+
+    return {'target': target, 'rows': rows}
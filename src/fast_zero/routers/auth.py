@@ -1,4 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    HTTPException,
+    Request,
+    status,
+)
 from sqlalchemy import select
 
 from fast_zero.db.models import User
@@ -7,18 +13,58 @@ from fast_zero.dependencies.annotated_types import (
     T_OAuthForm,
     T_Session,
 )
-from fast_zero.helpers.security import create_access_token, verify_password
+from fast_zero.helpers.exceptions import TooManyRequestsException
+from fast_zero.helpers.rate_limit import MemoryRateLimitBackend, RateLimiter
+from fast_zero.helpers.security import (
+    create_user_access_token,
+    hash_pool,
+    password_needs_rehash,
+    rehash_password,
+    verify_password,
+)
+from fast_zero.helpers.settings import env
 from fast_zero.schemas.schemas import Token
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
+login_rate_backend = MemoryRateLimitBackend(
+    max_keys=env.LOGIN_RATE_LIMIT_MAX_KEYS
+)
+
+ip_limiter = RateLimiter(
+    login_rate_backend,
+    name='login-ip',
+    capacity=env.LOGIN_IP_BURST,
+    per_minute=env.LOGIN_IP_PER_MINUTE,
+)
+
+username_limiter = RateLimiter(
+    login_rate_backend,
+    name='login-username',
+    capacity=env.LOGIN_USERNAME_BURST,
+    per_minute=env.LOGIN_USERNAME_PER_MINUTE,
+)
+
 
 @router.post(
     '/token',
     status_code=status.HTTP_200_OK,
     response_model=Token,
 )
-async def login_from_access_token(session: T_Session, form_data: T_OAuthForm):
+async def login_from_access_token(
+    request: Request,
+    session: T_Session,
+    form_data: T_OAuthForm,
+    background_tasks: BackgroundTasks,
+):
+    await ip_limiter.check(request.client.host if request.client else '')
+    await username_limiter.check(form_data.username.lower())
+
+    if hash_pool.saturated:
+        raise TooManyRequestsException(
+            detail='Too many pending password operations'
+        )
+
     incorrect_data_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail='Incorrect email or password',
@@ -31,16 +77,24 @@ async def login_from_access_token(session: T_Session, form_data: T_OAuthForm):
     if not user:
         raise incorrect_data_exception
 
-    if not verify_password(form_data.password, user.password):
+    if not await verify_password(form_data.password, user.password):
         raise incorrect_data_exception
 
-    token = create_access_token({'sub': user.email})
+    if password_needs_rehash(user.password):
+        background_tasks.add_task(
+            rehash_password,
+            user.id,
+            form_data.password,
+            user.password,
+        )
+
+    token = create_user_access_token(user)
 
     return {'access_token': token, 'token_type': 'Bearer'}
 
 
 @router.post('/refresh_token')
 async def refresh_access_token(user: T_CurrentUser):
-    new_access_token = create_access_token(data={'sub': user.email})
+    new_access_token = create_user_access_token(user)
 
     return {'access_token': new_access_token, 'token_type': 'Bearer'}
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from fast_zero.db.pool import pool_metrics
+from fast_zero.db.query_stats import query_metrics
+from fast_zero.dependencies.annotated_types import T_AdminUser
+from fast_zero.helpers.metrics import render_metrics
+from fast_zero.helpers.security import hash_pool
+
+router = APIRouter(prefix='/metrics', tags=['metrics'])
+
+
+@router.get(
+    '',
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+)
+async def get_metrics():
+    return PlainTextResponse(
+        render_metrics(pool_metrics.snapshot(), hash_pool.durations),
+        media_type='text/plain; version=0.0.4',
+    )
+
+
+@router.get('/queries', status_code=status.HTTP_200_OK)
+async def get_query_metrics(_: T_AdminUser):
+    return query_metrics.snapshot()
@@ -1,22 +1,153 @@
-from typing import Annotated
+from typing import Annotated, Callable
+from uuid import uuid4
 
-from fastapi import APIRouter, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Integer,
+    Select,
+    String,
+    and_,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio.session import AsyncSession
 
-from fast_zero.db.models import Todo
-from fast_zero.dependencies.annotated_types import T_CurrentUser, T_Session
-from fast_zero.helpers.exceptions import NotFoundException
+from fast_zero.db.connection import replicas
+from fast_zero.db.models import Todo, TodoState, todo_search_vector
+from fast_zero.dependencies.annotated_types import (
+    T_Principal,
+    T_ReadSession,
+    T_ReadSessionMaker,
+    T_Session,
+)
+from fast_zero.helpers.cache import TTLCache
+from fast_zero.helpers.etag import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    query_etag,
+)
+from fast_zero.helpers.exceptions import BadRequestException, NotFoundException
+from fast_zero.helpers.pagination import next_page, paginate
+from fast_zero.helpers.response_cache import (
+    CachedResponse,
+    MemoryBackend,
+    ResponseCache,
+)
+from fast_zero.helpers.serialization import (
+    list_response,
+    ndjson_rows,
+    public_columns,
+)
+from fast_zero.helpers.settings import env
 from fast_zero.schemas.schemas import (
     FilterTodo,
+    FilterTodoFields,
+    FilterTodoStats,
     Message,
+    TodoBatchCreate,
+    TodoBatchDelete,
+    TodoBatchResult,
+    TodoBatchUpdate,
     TodoList,
     TodoPublic,
     TodoSchema,
+    TodoStats,
     TodoUpdate,
 )
 
 router = APIRouter(prefix='/todos', tags=['todos'])
 
+stats_cache = TTLCache(
+    max_size=env.TODO_STATS_CACHE_MAX_SIZE,
+    ttl=env.TODO_STATS_CACHE_TTL_SECONDS,
+)
+
+stats_generations = TTLCache(
+    max_size=env.TODO_STATS_CACHE_MAX_SIZE,
+    ttl=env.TODO_STATS_CACHE_TTL_SECONDS,
+)
+
+todo_list_cache = ResponseCache(
+    MemoryBackend(max_bytes=env.TODO_LIST_CACHE_MAX_BYTES),
+    name='todos',
+    ttl=env.TODO_LIST_CACHE_TTL_SECONDS,
+)
+
+todo_columns = public_columns(Todo, TodoPublic)
+
+
+def stats_generation(user_id: int) -> str:
+    generation = stats_generations.get(user_id)
+
+    if generation is None:
+        generation = uuid4().hex
+        stats_generations.set(user_id, generation)
+
+    return generation
+
+
+async def invalidate_todos(user_id: int):
+    stats_generations.delete(user_id)
+    await todo_list_cache.invalidate(user_id)
+    replicas.stick(user_id)
+
+
+def search_query(q: str):
+    return func.websearch_to_tsquery(literal_column("'english'"), q)
+
+
+def filter_todos(query: Select, filter: FilterTodoFields) -> Select:
+    if filter.q:
+        query = query.filter(
+            todo_search_vector.bool_op('@@')(search_query(filter.q))
+        )
+
+    if filter.title:
+        query = query.filter(Todo.title.contains(filter.title))
+
+    if filter.description:
+        query = query.filter(Todo.description.contains(filter.description))
+
+    if filter.state:
+        query = query.filter(Todo.state == filter.state)
+
+    return query
+
+
+def in_range(column, filter: FilterTodoStats):
+    conditions = [true()]
+
+    if filter.start:
+        conditions.append(column >= filter.start)
+
+    if filter.end:
+        conditions.append(column < filter.end)
+
+    return and_(*conditions)
+
+
+async def stream_todos(
+    read_session: Callable[[], AsyncSession], query: Select
+):
+    async with read_session() as session:
+        todos = await session.stream(
+            query.with_only_columns(*todo_columns),
+            execution_options={'yield_per': env.EXPORT_BATCH_SIZE},
+        )
+
+        async for batch in todos.partitions():
+            yield ndjson_rows(batch)
+
 
 @router.post(
     '/',
@@ -26,7 +157,7 @@ router = APIRouter(prefix='/todos', tags=['todos'])
 async def create_todo(
     todo: TodoSchema,
     session: T_Session,
-    current_user: T_CurrentUser,
+    current_user: T_Principal,
 ):
     new_todo = Todo(
         **todo.model_dump(),
@@ -35,7 +166,7 @@ async def create_todo(
 
     session.add(new_todo)
     await session.commit()
-    await session.refresh(new_todo)
+    await invalidate_todos(current_user.id)
 
     return new_todo
 
@@ -46,61 +177,300 @@ async def create_todo(
     status_code=status.HTTP_200_OK,
 )
 async def get_todos(
-    current_user: T_CurrentUser,
-    session: T_Session,
+    request: Request,
+    response: Response,
+    current_user: T_Principal,
+    session: T_ReadSession,
     filter: Annotated[FilterTodo, Query()],
 ):
-    query = select(Todo).where(Todo.user_id == current_user.id)
+    cache_key = filter.model_dump_json()
+    generation, cached = await todo_list_cache.get(current_user.id, cache_key)
 
-    if filter.title:
-        query = query.filter(Todo.title.contains(filter.title))
+    if cached:
+        if etag_matches(request, cached.etag):
+            return not_modified(cached.etag)
 
-    if filter.description:
-        query = query.filter(Todo.description.contains(filter.description))
+        return Response(
+            cached.body,
+            media_type='application/json',
+            headers={'ETag': cached.etag},
+        )
 
-    if filter.state:
-        query = query.filter(Todo.state == filter.state)
+    query = filter_todos(
+        select(Todo).where(Todo.user_id == current_user.id), filter
+    )
+
+    if filter.q:
+        if filter.cursor:
+            raise BadRequestException(
+                detail='Cursor pagination is not supported with q'
+            )
+
+        rank = func.ts_rank(todo_search_vector, search_query(filter.q))
+        todos = await session.execute(
+            query.with_only_columns(*todo_columns)
+            .order_by(rank.desc(), Todo.id)
+            .offset(filter.offset)
+            .limit(filter.limit)
+        )
+        todos, next_cursor = todos.all(), None
+        etag = make_etag(
+            current_user.id,
+            cache_key,
+            [(todo.id, todo.updated_at) for todo in todos],
+        )
+    else:
+        etag = await query_etag(
+            session, query, Todo.updated_at, current_user.id, cache_key
+        )
+
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers['ETag'] = etag
+
+    if not filter.q:
+        todos = await session.execute(
+            paginate(query.with_only_columns(*todo_columns), Todo.id, filter)
+        )
+        todos, next_cursor = next_page(todos.all(), Todo.id, filter)
+
+    result = list_response(response, 'todos', todos, next_cursor)
+
+    if isinstance(result, Response):
+        await todo_list_cache.set(
+            current_user.id,
+            generation,
+            cache_key,
+            CachedResponse(etag, result.body),
+        )
+
+    return result
+
+
+@router.get('/export', status_code=status.HTTP_200_OK)
+async def export_todos(
+    current_user: T_Principal,
+    read_session: T_ReadSessionMaker,
+    filter: Annotated[FilterTodoFields, Query()],
+):
+    query = filter_todos(
+        select(Todo).where(Todo.user_id == current_user.id), filter
+    ).order_by(Todo.id)
+
+    return StreamingResponse(
+        stream_todos(read_session, query),
+        media_type='application/x-ndjson',
+    )
+
+
+@router.get('/stats', status_code=status.HTTP_200_OK, response_model=TodoStats)
+async def get_todo_stats(
+    current_user: T_Principal,
+    session: T_ReadSession,
+    filter: Annotated[FilterTodoStats, Query()],
+):
+    cache_key = (
+        current_user.id,
+        stats_generation(current_user.id),
+        filter.model_dump_json(),
+    )
+    cached = stats_cache.get(cache_key)
+
+    if cached is not None:
+        return cached
+
+    bucket = literal_column(f"'{filter.bucket}'")
+    created = func.date_trunc(bucket, Todo.created_at)
+    updated = func.date_trunc(bucket, Todo.updated_at)
+
+    rows = await session.execute(
+        select(
+            Todo.state,
+            created,
+            updated,
+            func.count(),
+            func.count().filter(in_range(Todo.created_at, filter)),
+            func.count().filter(in_range(Todo.updated_at, filter)),
+        )
+        .where(Todo.user_id == current_user.id)
+        .group_by(func.grouping_sets(Todo.state, created, updated))
+    )
+
+    stats = {
+        'states': {state: 0 for state in TodoState},
+        'created': [],
+        'updated': [],
+    }
+
+    for state, created_at, updated_at, total, n_created, n_updated in rows:
+        if state is not None:
+            stats['states'][state] = total
+
+        elif created_at is not None and n_created:
+            stats['created'].append({'bucket': created_at, 'count': n_created})
+
+        elif updated_at is not None and n_updated:
+            stats['updated'].append({'bucket': updated_at, 'count': n_updated})
+
+    stats['created'].sort(key=lambda item: item['bucket'])
+    stats['updated'].sort(key=lambda item: item['bucket'])
+
+    stats_cache.set(cache_key, stats)
+
+    return stats
+
+
+@router.post(
+    '/batch',
+    response_model=TodoBatchResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_todos(
+    batch: TodoBatchCreate,
+    session: T_Session,
+    current_user: T_Principal,
+):
+    todos = await session.scalars(
+        insert(Todo).returning(Todo, sort_by_parameter_order=True),
+        [
+            {**todo.model_dump(), 'user_id': current_user.id}
+            for todo in batch.todos
+        ],
+    )
+    todos = todos.all()
+
+    await session.commit()
+    await invalidate_todos(current_user.id)
+
+    return {
+        'results': [
+            {
+                'id': todo.id,
+                'status_code': status.HTTP_201_CREATED,
+                'todo': todo,
+            }
+            for todo in todos
+        ]
+    }
+
+
+@router.patch('/batch', response_model=TodoBatchResult)
+async def patch_todos(
+    batch: TodoBatchUpdate,
+    session: T_Session,
+    user: T_Principal,
+):
+    changes = values(
+        column('id', Integer),
+        column('title', String),
+        column('description', String),
+        column('state', String),
+        name='changes',
+    ).data([
+        (todo.id, todo.title, todo.description, todo.state)
+        for todo in batch.todos
+    ])
 
     todos = await session.scalars(
-        query.offset(filter.offset).limit(filter.limit)
+        update(Todo)
+        .where(Todo.id == changes.c.id, Todo.user_id == user.id)
+        .values(
+            title=func.coalesce(changes.c.title, Todo.title),
+            description=func.coalesce(changes.c.description, Todo.description),
+            state=func.coalesce(
+                cast(changes.c.state, Todo.state.type), Todo.state
+            ),
+        )
+        .returning(Todo)
+        .execution_options(synchronize_session=False, populate_existing=True)
     )
+    updated = {todo.id: todo for todo in todos}
+
+    await session.commit()
+    await invalidate_todos(user.id)
+
+    return {
+        'results': [
+            {
+                'id': todo.id,
+                'status_code': status.HTTP_200_OK
+                if todo.id in updated
+                else status.HTTP_404_NOT_FOUND,
+                'todo': updated.get(todo.id),
+            }
+            for todo in batch.todos
+        ]
+    }
 
-    return {'todos': todos.all()}
+
+@router.delete('/batch', response_model=TodoBatchResult)
+async def delete_todos(
+    batch: TodoBatchDelete,
+    session: T_Session,
+    user: T_Principal,
+):
+    deleted = await session.scalars(
+        delete(Todo)
+        .where(Todo.user_id == user.id, Todo.id.in_(batch.ids))
+        .returning(Todo.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = set(deleted)
+
+    await session.commit()
+    await invalidate_todos(user.id)
+
+    return {
+        'results': [
+            {
+                'id': todo_id,
+                'status_code': status.HTTP_200_OK
+                if todo_id in deleted
+                else status.HTTP_404_NOT_FOUND,
+            }
+            for todo_id in batch.ids
+        ]
+    }
 
 
 @router.patch('/{todo_id}', response_model=TodoPublic)
 async def patch_todo(
     todo_id: int,
     session: T_Session,
-    user: T_CurrentUser,
+    user: T_Principal,
     todo: TodoUpdate,
 ):
     db_todo = await session.scalar(
-        select(Todo).where(Todo.user_id == user.id, Todo.id == todo_id)
+        update(Todo)
+        .where(Todo.user_id == user.id, Todo.id == todo_id)
+        .values(**todo.model_dump(exclude_unset=True))
+        .returning(Todo)
+        .execution_options(synchronize_session=False, populate_existing=True)
     )
 
     if not db_todo:
         raise NotFoundException(detail='Task not found')
 
-    for key, value in todo.model_dump(exclude_unset=True).items():
-        setattr(db_todo, key, value)
-
-    session.add(db_todo)
     await session.commit()
-    await session.refresh(db_todo)
+    await invalidate_todos(user.id)
 
     return db_todo
 
 
 @router.delete('/{todo_id}', response_model=Message)
-async def delete_todo(todo_id: int, session: T_Session, user: T_CurrentUser):
-    todo = await session.scalar(
-        select(Todo).where(Todo.user_id == user.id, Todo.id == todo_id)
+async def delete_todo(todo_id: int, session: T_Session, user: T_Principal):
+    deleted_id = await session.scalar(
+        delete(Todo)
+        .where(Todo.user_id == user.id, Todo.id == todo_id)
+        .returning(Todo.id)
+        .execution_options(synchronize_session=False)
     )
 
-    if not todo:
+    if not deleted_id:
         raise NotFoundException(detail='Task not found')
 
-    await session.delete(todo)
+    await session.commit()
+    await invalidate_todos(user.id)
 
     return {'message': 'Task has been deleted successfully'}
@@ -1,13 +1,32 @@
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 
+from fast_zero.db.connection import replicas
 from fast_zero.db.models import User
-from fast_zero.dependencies.annotated_types import T_CurrentUser, T_Session
-from fast_zero.helpers.exceptions import NotFoundException, PermissionException
-from fast_zero.helpers.security import get_password_hash
+from fast_zero.dependencies.annotated_types import (
+    T_Principal,
+    T_ReadSession,
+    T_Session,
+    T_TokenPrincipal,
+)
+from fast_zero.helpers.etag import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    query_etag,
+)
+from fast_zero.helpers.exceptions import (
+    CredentialsException,
+    NotFoundException,
+    PermissionException,
+)
+from fast_zero.helpers.pagination import next_page, paginate
+from fast_zero.helpers.security import get_password_hash, invalidate_user
+from fast_zero.helpers.serialization import list_response, public_columns
 from fast_zero.schemas.schemas import (
     FilterPage,
     Message,
@@ -18,17 +37,32 @@ from fast_zero.schemas.schemas import (
 
 router = APIRouter(prefix='/users', tags=['users'])
 
+user_columns = public_columns(User, UserPublic)
+
 
 @router.get('/', status_code=status.HTTP_200_OK, response_model=UsersList)
 async def get_users(
-    _: T_CurrentUser,
-    session: T_Session,
+    request: Request,
+    response: Response,
+    _: T_Principal,
+    session: T_ReadSession,
     filter: Annotated[FilterPage, Query()],
 ):
-    users = await session.scalars(
-        select(User).limit(filter.limit).offset(filter.offset)
+    etag = await query_etag(
+        session, select(User), User.updated_at, filter.model_dump_json()
     )
-    return {'users': users}
+
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers['ETag'] = etag
+
+    users = await session.execute(
+        paginate(select(*user_columns), User.id, filter)
+    )
+    users, next_cursor = next_page(users.all(), User.id, filter)
+
+    return list_response(response, 'users', users, next_cursor)
 
 
 @router.get(
@@ -37,15 +71,24 @@ async def get_users(
     response_model=UserPublic,
 )
 async def get_user_by_id(
-    _: T_CurrentUser,
+    request: Request,
+    response: Response,
+    _: T_Principal,
     user_id: int,
-    session: T_Session,
+    session: T_ReadSession,
 ):
     user = await session.get(User, user_id)
 
     if not user:
         raise NotFoundException(detail='User not found')
 
+    etag = make_etag(user.id, user.updated_at)
+
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers['ETag'] = etag
+
     return user
 
 
@@ -55,33 +98,30 @@ async def get_user_by_id(
     response_model=UserPublic,
 )
 async def create_user(user: UserSchema, session: T_Session):
-    db_user = await session.scalar(
-        select(User).where(
-            (User.username == user.username) | (User.email == user.email)
+    try:
+        new_user = await session.scalar(
+            insert(User)
+            .values(username=user.username, email=user.email, password='')
+            .on_conflict_do_nothing(index_elements=[User.username])
+            .returning(User)
         )
-    )
 
-    if db_user:
-        if db_user.username == user.username:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail='Username already exists',
-            )
-        elif db_user.email == user.email:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail='Email already exists',
-            )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail='Email already exists',
+        )
 
-    new_user = User(
-        username=user.username,
-        email=user.email,
-        password=get_password_hash(user.password),
-    )
+    if new_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail='Username already exists',
+        )
+
+    new_user.password = await get_password_hash(user.password)
 
-    session.add(new_user)
     await session.commit()
-    await session.refresh(new_user)
+    replicas.stick(new_user.id)
 
     return new_user
 
@@ -95,20 +135,28 @@ async def update_user(
     user_id: int,
     user: UserSchema,
     session: T_Session,
-    current_user: T_CurrentUser,
+    principal: T_TokenPrincipal,
 ):
-    if current_user.id != user_id:
+    if principal.id != user_id:
         raise PermissionException()
 
-    try:
-        current_user.username = user.username
-        current_user.email = user.email
-        current_user.password = get_password_hash(user.password)
-
-        await session.commit()
-        await session.refresh(current_user)
+    password = await get_password_hash(user.password)
 
-        return current_user
+    try:
+        updated_user = await session.scalar(
+            update(User)
+            .where(
+                User.id == user_id,
+                User.token_version == principal.token_version,
+            )
+            .values(
+                username=user.username,
+                email=user.email,
+                password=password,
+                token_version=User.token_version + 1,
+            )
+            .returning(User)
+        )
 
     except IntegrityError:
         raise HTTPException(
@@ -116,6 +164,15 @@ async def update_user(
             detail='Username or Email already exists',
         )
 
+    if updated_user is None:
+        raise CredentialsException()
+
+    await session.commit()
+    invalidate_user(user_id)
+    replicas.stick(user_id)
+
+    return updated_user
+
 
 @router.delete(
     '/{user_id}',
@@ -125,12 +182,24 @@ async def update_user(
 async def delete_user(
     user_id: int,
     session: T_Session,
-    current_user: T_CurrentUser,
+    principal: T_TokenPrincipal,
 ):
-    if current_user.id != user_id:
+    if principal.id != user_id:
         raise PermissionException()
 
-    await session.delete(current_user)
+    deleted_id = await session.scalar(
+        delete(User)
+        .where(
+            User.id == user_id,
+            User.token_version == principal.token_version,
+        )
+        .returning(User.id)
+    )
+
+    if deleted_id is None:
+        raise CredentialsException()
+
     await session.commit()
+    invalidate_user(user_id)
 
     return {'message': 'User deleted'}
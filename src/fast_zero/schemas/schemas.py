@@ -1,8 +1,10 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from fast_zero.db.models import TodoState
+from fast_zero.helpers.settings import env
 
 
 class Message(BaseModel):
@@ -25,6 +27,7 @@ class UserPublic(BaseModel):
 
 class UsersList(BaseModel):
     users: list[UserPublic]
+    next_cursor: str | None = None
 
 
 class Token(BaseModel):
@@ -33,16 +36,22 @@ class Token(BaseModel):
 
 
 class FilterPage(BaseModel):
-    limit: int = Field(ge=1, default=10)
+    limit: int = Field(ge=1, le=env.MAX_PAGE_SIZE, default=10)
     offset: int = Field(ge=0, default=0)
+    cursor: str | None = None
 
 
-class FilterTodo(FilterPage):
+class FilterTodoFields(BaseModel):
+    q: str | None = Field(default=None, min_length=1)
     title: str | None = Field(default=None, min_length=3)
     description: str | None = Field(default=None, min_length=3)
     state: TodoState | None = None
 
 
+class FilterTodo(FilterPage, FilterTodoFields):
+    pass
+
+
 class TodoSchema(BaseModel):
     title: str
     description: str
@@ -54,12 +63,77 @@ class TodoPublic(TodoSchema):
     created_at: datetime
     updated_at: datetime
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class TodoList(BaseModel):
     todos: list[TodoPublic]
+    next_cursor: str | None = None
 
 
 class TodoUpdate(BaseModel):
     title: str | None = None
     description: str | None = None
     state: TodoState | None = None
+
+
+class TodoUpdateItem(TodoUpdate):
+    id: int
+
+
+class TodoBatchCreate(BaseModel):
+    todos: list[TodoSchema] = Field(
+        min_length=1, max_length=env.MAX_BATCH_SIZE
+    )
+
+
+class TodoBatchUpdate(BaseModel):
+    todos: list[TodoUpdateItem] = Field(
+        min_length=1, max_length=env.MAX_BATCH_SIZE
+    )
+
+
+class TodoBatchDelete(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=env.MAX_BATCH_SIZE)
+
+
+class TodoResult(BaseModel):
+    id: int
+    status_code: int
+    todo: TodoPublic | None = None
+
+
+class TodoBatchResult(BaseModel):
+    results: list[TodoResult]
+
+
+class FilterTodoStats(BaseModel):
+    start: datetime | None = None
+    end: datetime | None = None
+    bucket: Literal['hour', 'day', 'week', 'month'] = 'day'
+
+
+class TodoBucket(BaseModel):
+    bucket: datetime
+    count: int
+
+
+class TodoStats(BaseModel):
+    states: dict[TodoState, int]
+    created: list[TodoBucket]
+    updated: list[TodoBucket]
+
+
+class TodoImport(TodoSchema):
+    user_id: int
+
+
+class UserImport(BaseModel):
+    username: str
+    email: EmailStr
+    password: str
+
+
+class ImportResult(BaseModel):
+    target: str
+    rows: int
@@ -11,12 +11,30 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.pool import NullPool
 from testcontainers.postgres import PostgresContainer
 
 from fast_zero.app import app
-from fast_zero.db.connection import get_session
+from fast_zero.db.connection import get_session, replicas
 from fast_zero.db.models import table_registry
-from fast_zero.helpers.security import get_password_hash
+from fast_zero.db.query_stats import instrument_queries, query_metrics
+from fast_zero.dependencies.database import (
+    get_read_session,
+    get_read_sessionmaker,
+)
+from fast_zero.helpers.security import (
+    get_password_hash,
+    principal_cache,
+    token_service,
+    user_cache,
+)
+from fast_zero.helpers.settings import env
+from fast_zero.routers.auth import login_rate_backend
+from fast_zero.routers.todos import (
+    stats_cache,
+    stats_generations,
+    todo_list_cache,
+)
 from tests.factories import UserFactory
 
 
@@ -28,7 +46,13 @@ def anyio_backend():
 @pytest.fixture(scope='session')
 def engine():
     with PostgresContainer('postgres:17', driver='psycopg') as postgres:
-        yield create_async_engine(postgres.get_connection_url())
+        engine = create_async_engine(
+            postgres.get_connection_url(),
+            connect_args={'prepare_threshold': None},
+        )
+        instrument_queries(engine)
+
+        yield engine
 
 
 @pytest.fixture
@@ -55,7 +79,7 @@ async def session(
 async def user(session: AsyncSession):
     clean_password = 'secret'
 
-    user = UserFactory(password=get_password_hash(clean_password))
+    user = UserFactory(password=await get_password_hash(clean_password))
 
     session.add(user)
     await session.commit()
@@ -70,7 +94,7 @@ async def user(session: AsyncSession):
 async def other_user(session: AsyncSession):
     clean_password = 'secret2'
 
-    user = UserFactory(password=get_password_hash(clean_password))
+    user = UserFactory(password=await get_password_hash(clean_password))
 
     session.add(user)
     await session.commit()
@@ -82,14 +106,53 @@ async def other_user(session: AsyncSession):
 
 
 @pytest.fixture
-def client(session):
+def admin(monkeypatch, user):
+    monkeypatch.setattr(env, 'ADMIN_EMAILS', [user.email])
+
+    return user
+
+
+@pytest.fixture
+def client(engine: AsyncEngine, session):
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = lambda: session
+        app.dependency_overrides[get_read_session] = lambda: session
+        app.dependency_overrides[get_read_sessionmaker] = lambda: (
+            async_sessionmaker(
+                bind=create_async_engine(engine.url, poolclass=NullPool),
+                expire_on_commit=False,
+            )
+        )
         yield client
 
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def isolated_sessions(engine: AsyncEngine, session):
+    isolated_engine = create_async_engine(engine.url, poolclass=NullPool)
+    async_session = async_sessionmaker(
+        bind=isolated_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+    async def get_isolated_session():
+        async with async_session() as request_session:
+            yield request_session
+
+    app.dependency_overrides[get_session] = get_isolated_session
+    app.dependency_overrides[get_read_sessionmaker] = lambda: async_session
+    yield isolated_engine
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def isolated_client(isolated_sessions):
+    with TestClient(app) as client:
+        yield client
+
+
 @pytest.fixture
 def token(client: TestClient, user) -> str:
     response = client.post(
@@ -117,3 +180,63 @@ def _mock_db_time(*, model, time=datetime(2025, 1, 1)):
 @pytest.fixture
 def mock_db_time():
     return _mock_db_time
+
+
+@contextmanager
+def _count_queries(engine: AsyncEngine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+    yield statements
+    event.remove(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+
+
+@pytest.fixture
+def count_queries(engine: AsyncEngine):
+    return lambda: _count_queries(engine)
+
+
+@contextmanager
+def _query_budget(max_queries: int):
+    query_metrics.reset()
+    yield
+
+    for route, stats in query_metrics.snapshot().items():
+        assert stats['max_queries'] <= max_queries, (
+            f'{route} issued {stats["max_queries"]} queries, '
+            f'budget is {max_queries}'
+        )
+
+
+@pytest.fixture
+def query_budget():
+    return _query_budget
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    caches = [
+        user_cache,
+        principal_cache,
+        token_service.cache,
+        stats_cache,
+        stats_generations,
+        replicas.writers,
+        todo_list_cache,
+        login_rate_backend,
+    ]
+
+    for cache in caches:
+        cache.clear()
+
+    yield
+
+    for cache in caches:
+        cache.clear()
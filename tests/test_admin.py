@@ -0,0 +1,208 @@
+import json
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from fast_zero.db.models import Todo, TodoState, User
+from fast_zero.helpers.security import (
+    pwd_context,
+    snapshot_user,
+    user_cache,
+)
+from fast_zero.helpers.settings import env
+
+
+@pytest.fixture
+def admin(monkeypatch, admin):
+    monkeypatch.setattr(env, 'IMPORT_CHUNK_SIZE', 2)
+
+    return admin
+
+
+async def test_import_todos_from_csv(
+    session: AsyncSession, client: TestClient, admin, token
+):
+    expected_todos = 3
+    body = (
+        'title,description,state,user_id\n'
+        f'First,"Has, a comma",done,{admin.id}\n'
+        f'Second,Plain,doing,{admin.id}\n'
+        f'Third,Plain,todo,{admin.id}\n'
+    )
+
+    response = client.post(
+        '/admin/import/todos',
+        headers={'Authorization': f'Bearer {token}'},
+        content=body,
+    )
+
+    todos = (await session.scalars(select(Todo).order_by(Todo.id))).all()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {'target': 'todos', 'rows': expected_todos}
+    assert [todo.title for todo in todos] == ['First', 'Second', 'Third']
+    assert todos[0].description == 'Has, a comma'
+    assert todos[0].state == TodoState.done
+
+
+async def test_import_users_from_ndjson(
+    session: AsyncSession, client: TestClient, admin, token
+):
+    password = pwd_context.hash('imported')
+    body = '\n'.join(
+        json.dumps({
+            'username': f'imported{n}',
+            'email': f'imported{n}@test.com',
+            'password': password,
+        })
+        for n in range(3)
+    )
+
+    response = client.post(
+        '/admin/import/users?format=ndjson',
+        headers={'Authorization': f'Bearer {token}'},
+        content=body,
+    )
+
+    expected_users = 4
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert await session.scalar(select(func.count(User.id))) == expected_users
+
+    response = client.post(
+        '/auth/token',
+        data={'username': 'imported1@test.com', 'password': 'imported'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_import_users_rejects_plain_passwords(
+    client: TestClient, admin, token
+):
+    body = json.dumps({
+        'username': 'plain',
+        'email': 'plain@test.com',
+        'password': 'not-a-hash',
+    })
+
+    response = client.post(
+        '/admin/import/users?format=ndjson',
+        headers={'Authorization': f'Bearer {token}'},
+        content=body,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {
+        'detail': (
+            'Row 1: password must be a supported password hash '
+            '(0 rows already imported)'
+        )
+    }
+
+
+def test_import_todos_unknown_user(client: TestClient, admin, token):
+    response = client.post(
+        '/admin/import/todos',
+        headers={'Authorization': f'Bearer {token}'},
+        content='title,description,user_id\nFirst,Plain,999\n',
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['detail'].startswith('Rows 1-1: insert or update')
+
+
+async def test_import_malformed_ndjson_reports_committed_rows(
+    session: AsyncSession, client: TestClient, admin, token
+):
+    expected_todos = 2
+    record = json.dumps({
+        'title': 'Imported',
+        'description': 'Plain',
+        'user_id': admin.id,
+    })
+
+    response = client.post(
+        '/admin/import/todos?format=ndjson',
+        headers={'Authorization': f'Bearer {token}'},
+        content=f'{record}\n{record}\n{{"title": \n{record}\n',
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['detail'].startswith('Row 3: ')
+    assert response.json()['detail'].endswith('(2 rows already imported)')
+    assert await session.scalar(select(func.count(Todo.id))) == expected_todos
+
+
+@pytest.mark.parametrize('format', ['csv', 'ndjson'])
+def test_import_rejects_invalid_utf8(client: TestClient, admin, token, format):
+    response = client.post(
+        f'/admin/import/todos?format={format}',
+        headers={'Authorization': f'Bearer {token}'},
+        content=b'\xff\xfe\n',
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "codec can't decode" in response.json()['detail']
+
+
+def test_import_requires_admin(client: TestClient, token):
+    response = client.post(
+        '/admin/import/todos',
+        headers={'Authorization': f'Bearer {token}'},
+        content='title,description,user_id\n',
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.json() == {'detail': 'Not enough permissions'}
+
+
+def test_failed_import_should_not_break_cached_user(
+    isolated_client: TestClient, admin
+):
+    response = isolated_client.post(
+        '/auth/token',
+        data={'username': admin.email, 'password': admin.clean_password},
+    )
+    headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+    response = isolated_client.post(
+        '/admin/import/todos',
+        headers=headers,
+        content='title,description,state,user_id\nOrphan,Plain,todo,999\n',
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = isolated_client.post('/auth/refresh_token', headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_import_rejects_revoked_token_with_stale_cache(
+    client: TestClient, admin, token
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    stale_admin = snapshot_user(admin)
+
+    client.put(
+        f'/users/{admin.id}',
+        headers=headers,
+        json={
+            'username': admin.username,
+            'email': admin.email,
+            'password': 'new-password',
+        },
+    )
+    user_cache.set(admin.id, stale_admin)
+
+    response = client.post(
+        '/admin/import/todos',
+        headers=headers,
+        content='title,description,user_id\n',
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -1,8 +1,23 @@
+import jwt
 from fastapi import status
 from fastapi.testclient import TestClient
 from freezegun import freeze_time
-
-from fast_zero.helpers.security import create_access_token
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.pool import NullPool
+
+from fast_zero.helpers import security
+from fast_zero.helpers.security import (
+    create_access_token,
+    hash_pool,
+    password_needs_rehash,
+    principal_cache,
+    pwd_context,
+    user_cache,
+)
+from fast_zero.helpers.settings import env
+from fast_zero.routers.auth import ip_limiter
 
 
 def test_get_current_user_not_found(client: TestClient):
@@ -131,3 +146,130 @@ def test_token_expired_should_not_refresh(client: TestClient, user):
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert response.json() == {'detail': 'Token has expired'}
+
+
+def test_get_current_user_is_cached(client: TestClient, user, token):
+    for _ in range(2):
+        response = client.post(
+            '/auth/refresh_token',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+    assert user_cache.stats()['misses'] == 1
+    assert user_cache.stats()['hits'] == 1
+
+
+def test_token_carries_user_id_and_version(client: TestClient, user, token):
+    payload = jwt.decode(token, env.SECRET_KEY, env.ALGORITHM)
+
+    assert payload['uid'] == user.id
+    assert payload['ver'] == user.token_version
+
+
+def test_principal_does_not_load_user(
+    client: TestClient, token, count_queries
+):
+    with count_queries() as queries:
+        client.get('/todos/', headers={'Authorization': f'Bearer {token}'})
+        client.get('/todos/', headers={'Authorization': f'Bearer {token}'})
+
+    assert queries[0].startswith('SELECT users.token_version')
+    assert not any(q.startswith('SELECT users.id') for q in queries)
+    assert principal_cache.stats()['hits'] == 1
+
+
+async def test_login_rehashes_outdated_password(
+    session: AsyncSession, client: TestClient, user, engine, monkeypatch
+):
+    monkeypatch.setattr(
+        security,
+        'AsyncSessionLocal',
+        async_sessionmaker(
+            bind=create_async_engine(engine.url, poolclass=NullPool)
+        ),
+    )
+    weak_hasher = Argon2Hasher(time_cost=1, memory_cost=8192, parallelism=1)
+    user.password = weak_hasher.hash(user.clean_password)
+    await session.commit()
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    await session.refresh(user)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not password_needs_rehash(user.password)
+    assert pwd_context.verify(user.clean_password, user.password)
+
+
+async def test_login_keeps_current_password_hash(
+    session: AsyncSession, client: TestClient, user
+):
+    password = user.password
+
+    client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    await session.refresh(user)
+
+    assert user.password == password
+
+
+def test_login_is_rate_limited_per_username(client: TestClient, user):
+    for _ in range(env.LOGIN_USERNAME_BURST):
+        client.post(
+            '/auth/token',
+            data={'username': user.email, 'password': 'wrong'},
+        )
+
+    hashes = hash_pool.durations.count
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response.json() == {'detail': 'Too many requests'}
+    assert int(response.headers['Retry-After']) > 0
+    assert hash_pool.durations.count == hashes
+
+
+def test_login_is_rate_limited_per_ip(client: TestClient, monkeypatch):
+    monkeypatch.setattr(ip_limiter, 'capacity', 2)
+
+    statuses = [
+        client.post(
+            '/auth/token',
+            data={'username': f'user{n}@test.com', 'password': 'wrong'},
+        ).status_code
+        for n in range(3)
+    ]
+
+    assert statuses == [
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_429_TOO_MANY_REQUESTS,
+    ]
+
+
+def test_login_rejected_when_hash_pool_is_saturated(
+    client: TestClient, user, monkeypatch
+):
+    monkeypatch.setattr(hash_pool, 'pending', hash_pool.max_pending)
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response.json() == {
+        'detail': 'Too many pending password operations'
+    }
+    assert response.headers['Retry-After'] == '1'
@@ -0,0 +1,159 @@
+import pytest
+from freezegun import freeze_time
+
+from fast_zero.helpers.cache import TTLCache
+from fast_zero.helpers.exceptions import TooManyRequestsException
+from fast_zero.helpers.rate_limit import MemoryRateLimitBackend, RateLimiter
+from fast_zero.helpers.response_cache import (
+    CachedResponse,
+    MemoryBackend,
+    ResponseCache,
+)
+
+
+class FakeSharedBackend:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_cache_get_and_set():
+    cache = TTLCache(max_size=2, ttl=60)
+
+    cache.set('key', 'value')
+
+    assert cache.get('key') == 'value'
+    assert cache.get('other') is None
+    assert cache.stats() == {'size': 1, 'max_size': 2, 'hits': 1, 'misses': 1}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=60)
+
+    cache.set('a', 'first')
+    cache.set('b', 'second')
+    cache.get('a')
+    cache.set('c', 'third')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'first'
+    assert cache.get('c') == 'third'
+
+
+def test_cache_entry_expires_after_ttl():
+    cache = TTLCache(max_size=2, ttl=60)
+
+    with freeze_time('2025-01-01 12:00:00'):
+        cache.set('key', 'value')
+
+    with freeze_time('2025-01-01 12:01:01'):
+        assert cache.get('key') is None
+        assert len(cache) == 0
+
+
+def test_cache_delete_and_clear():
+    cache = TTLCache(max_size=2, ttl=60)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.delete('a')
+
+    assert cache.get('a') is None
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.stats()['misses'] == 0
+
+
+@pytest.mark.anyio
+async def test_memory_backend_evicts_to_stay_under_max_bytes():
+    backend = MemoryBackend(max_bytes=20)
+
+    await backend.set('a', b'0123456789', ttl=60)
+    await backend.set('b', b'0123456789', ttl=60)
+
+    assert await backend.get('a') is None
+    assert await backend.get('b') == b'0123456789'
+    assert backend.size_bytes == len('b') + len(b'0123456789')
+
+
+@pytest.mark.anyio
+async def test_memory_backend_entry_expires_after_ttl():
+    backend = MemoryBackend(max_bytes=100)
+
+    with freeze_time('2025-01-01 12:00:00'):
+        await backend.set('key', b'value', ttl=60)
+
+    with freeze_time('2025-01-01 12:01:01'):
+        assert await backend.get('key') is None
+        assert backend.size_bytes == 0
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    'backend', [MemoryBackend(max_bytes=1024), FakeSharedBackend()]
+)
+async def test_response_cache_hit_and_invalidate(backend):
+    cache = ResponseCache(backend, name='test', ttl=60)
+    response = CachedResponse(etag='W/"abc"', body=b'{"todos": []}')
+
+    generation, cached = await cache.get(1, 'filter')
+    await cache.set(1, generation, 'filter', response)
+
+    assert cached is None
+    assert (await cache.get(1, 'filter'))[1] == response
+
+    await cache.invalidate(1)
+
+    assert (await cache.get(1, 'filter'))[1] is None
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'hit_ratio': 1 / 3}
+
+
+@pytest.mark.anyio
+async def test_response_cache_skips_set_after_invalidation():
+    cache = ResponseCache(FakeSharedBackend(), name='test', ttl=60)
+
+    generation, _ = await cache.get(1, 'filter')
+    await cache.invalidate(1)
+    await cache.set(1, generation, 'filter', CachedResponse('W/"a"', b'{}'))
+
+    assert (await cache.get(1, 'filter'))[1] is None
+
+
+@pytest.mark.anyio
+async def test_rate_limit_bucket_refills_over_time():
+    limiter = RateLimiter(
+        MemoryRateLimitBackend(max_keys=8), 'test', capacity=2, per_minute=6
+    )
+
+    with freeze_time('2025-01-01 12:00:00'):
+        await limiter.check('key')
+        await limiter.check('key')
+
+        with pytest.raises(TooManyRequestsException) as error:
+            await limiter.check('key')
+
+    assert error.value.headers == {'Retry-After': '10'}
+
+    with freeze_time('2025-01-01 12:00:10'):
+        await limiter.check('key')
+
+
+@pytest.mark.anyio
+async def test_rate_limit_backend_is_bounded():
+    max_keys = 2
+    backend = MemoryRateLimitBackend(max_keys=max_keys)
+
+    for key in ['a', 'b', 'c']:
+        await backend.take(key, capacity=1, rate=1)
+
+    assert len(backend) == max_keys
@@ -1,9 +1,15 @@
 from dataclasses import asdict
 
-from sqlalchemy import select
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
-from fast_zero.db.models import User
+from fast_zero.db.models import Todo, User
+from fast_zero.db.pool import InstrumentedPool, pool_metrics
+from fast_zero.db.replicas import ReplicaSet
+from tests.factories import TodoFactory
 
 
 async def test_create_user(session: AsyncSession, mock_db_time):
@@ -20,6 +26,7 @@ async def test_create_user(session: AsyncSession, mock_db_time):
         'username': 'test',
         'email': 'test@test.com',
         'password': 'secret',
+        'token_version': 0,
         'created_at': time,
         'updated_at': time,
         'todos': [],
@@ -39,3 +46,154 @@ async def test_create_user(session: AsyncSession, mock_db_time):
 
 #     with pytest.raises(LookupError):
 #         await session.scalar(select(Todo))
+
+
+async def test_user_does_not_load_todos(session: AsyncSession, user):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+    session.expunge_all()
+
+    fetched_user = await session.scalar(select(User).where(User.id == user.id))
+
+    assert fetched_user.todos == []
+
+
+async def test_delete_user_cascades_todos(session: AsyncSession, user):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+
+    await session.delete(user)
+    await session.commit()
+
+    assert await session.scalar(select(func.count(Todo.id))) == 0
+
+
+@pytest.mark.parametrize(
+    ('where', 'index'),
+    [
+        ("user_id = 1 AND state = 'done'", 'ix_todos_user_id_state_id'),
+        ('user_id = 1 AND id > 10 ORDER BY id', 'ix_todos_user_id_id'),
+        ("title LIKE '%test%'", 'ix_todos_title_trgm'),
+        ("description LIKE '%test%'", 'ix_todos_description_trgm'),
+        (
+            "search_vector @@ websearch_to_tsquery('english', 'test')",
+            'ix_todos_search_vector',
+        ),
+    ],
+)
+async def test_todos_queries_use_indexes(session: AsyncSession, where, index):
+    await session.execute(text('SET LOCAL enable_seqscan = off'))
+
+    plan = await session.scalars(
+        text(f'EXPLAIN SELECT * FROM todos WHERE {where}')
+    )
+
+    assert index in '\n'.join(plan)
+
+
+async def test_todo_stats_query_uses_index(session: AsyncSession):
+    await session.execute(text('SET LOCAL enable_seqscan = off'))
+
+    plan = await session.scalars(
+        text(
+            'EXPLAIN SELECT state, count(*) FROM todos '
+            'WHERE user_id = 1 GROUP BY state'
+        )
+    )
+
+    assert 'Index Cond: (user_id = 1)' in '\n'.join(plan)
+
+
+@pytest.mark.anyio
+async def test_instrumented_pool_publishes_metrics(engine: AsyncEngine):
+    pool_timeout = 0.1
+    pool_engine = create_async_engine(
+        engine.url,
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=pool_timeout,
+    )
+    checkouts = pool_metrics.checkouts
+    timeouts = pool_metrics.timeouts
+
+    async with pool_engine.connect():
+        assert pool_metrics.checked_out == 1
+
+        with pytest.raises(TimeoutError):
+            await pool_engine.connect()
+
+    assert pool_metrics.checked_out == 0
+    assert pool_metrics.checkouts == checkouts + 1
+    assert pool_metrics.timeouts == timeouts + 1
+    assert pool_metrics.wait_seconds_max >= pool_timeout * 0.9
+
+    await pool_engine.dispose()
+
+
+def test_replica_set_without_replicas_uses_primary(engine: AsyncEngine):
+    replica_set = ReplicaSet(
+        engine, [], 'round_robin', sticky_seconds=5, max_sticky=10
+    )
+
+    assert replica_set.pick(1) is engine
+
+
+def test_replica_set_round_robin(engine: AsyncEngine):
+    replicas = [create_async_engine(engine.url) for _ in range(2)]
+    replica_set = ReplicaSet(
+        engine, replicas, 'round_robin', sticky_seconds=5, max_sticky=10
+    )
+
+    picked = [replica_set.pick(1) for _ in range(4)]
+
+    assert picked == [*replicas, *replicas]
+
+
+def test_replica_set_sticks_writers_to_primary(engine: AsyncEngine):
+    replicas = [create_async_engine(engine.url)]
+    replica_set = ReplicaSet(
+        engine, replicas, 'round_robin', sticky_seconds=5, max_sticky=10
+    )
+
+    replica_set.stick(1)
+
+    assert replica_set.pick(1) is engine
+    assert replica_set.pick(2) is replicas[0]
+
+
+def test_replica_set_sticky_client_reads_from_primary(engine: AsyncEngine):
+    replicas = [create_async_engine(engine.url)]
+    replica_set = ReplicaSet(
+        engine, replicas, 'round_robin', sticky_seconds=5, max_sticky=10
+    )
+
+    assert replica_set.pick(1, sticky=True) is engine
+    assert replica_set.pick(1) is replicas[0]
+
+
+def test_replica_set_sticky_window_expires(engine: AsyncEngine):
+    replicas = [create_async_engine(engine.url)]
+    replica_set = ReplicaSet(
+        engine, replicas, 'round_robin', sticky_seconds=0, max_sticky=10
+    )
+
+    replica_set.stick(1)
+
+    assert replica_set.pick(1) is replicas[0]
+
+
+@pytest.mark.anyio
+async def test_replica_set_least_busy(engine: AsyncEngine):
+    replicas = [create_async_engine(engine.url) for _ in range(2)]
+    replica_set = ReplicaSet(
+        engine, replicas, 'least_busy', sticky_seconds=5, max_sticky=10
+    )
+
+    async with replicas[0].connect():
+        picked = {replica_set.pick(1) for _ in range(4)}
+
+    assert picked == {replicas[1]}
+
+    for replica in replicas:
+        await replica.dispose()
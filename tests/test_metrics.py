@@ -0,0 +1,113 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from fast_zero.db.query_stats import query_metrics
+from fast_zero.helpers.metrics import Histogram, http_metrics
+
+
+def test_server_timing_header_reports_queries(client: TestClient, token):
+    response = client.get(
+        '/todos/', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    timing = response.headers['Server-Timing']
+
+    assert timing.startswith('db;dur=')
+    assert 'queries"' in timing
+    assert 'db-slowest;dur=' in timing
+
+
+def test_query_metrics_are_grouped_by_route_template(
+    client: TestClient, admin, token
+):
+    expected_requests = 2
+    query_metrics.reset()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.get(f'/users/{admin.id}', headers=headers)
+    client.get(f'/users/{admin.id}', headers=headers)
+
+    response = client.get('/metrics/queries', headers=headers)
+    route = response.json()['GET /users/{user_id}']
+
+    assert response.status_code == status.HTTP_200_OK
+    assert route['requests'] == expected_requests
+    assert route['max_queries'] >= 1
+    assert route['slowest_statement'].startswith('SELECT')
+
+
+def test_query_budget_fails_when_route_exceeds_budget(
+    client: TestClient, token, query_budget
+):
+    with (
+        pytest.raises(AssertionError, match='GET /todos/ issued'),
+        query_budget(0),
+    ):
+        client.get('/todos/', headers={'Authorization': f'Bearer {token}'})
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(5)
+
+    assert histogram.render('latency', 'route="/"') == [
+        'latency_bucket{route="/",le="0.1"} 2',
+        'latency_bucket{route="/",le="1.0"} 2',
+        'latency_bucket{route="/",le="+Inf"} 3',
+        'latency_sum{route="/"} 5.15',
+        'latency_count{route="/"} 3',
+    ]
+
+
+def test_metrics_endpoint_uses_route_templates(client: TestClient, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.patch('/todos/123', headers=headers, json={'title': 'x'})
+    client.get('/does-not-exist')
+
+    response = client.get('/metrics')
+    body = response.text
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        'http_responses_total{method="PATCH",route="/todos/{todo_id}",'
+        'status="404"}'
+    ) in body
+    assert 'route="/todos/123"' not in body
+    assert 'route="unmatched",status="404"' in body
+    assert 'http_requests_in_flight 1' in body
+    assert '# TYPE db_pool_checked_out gauge' in body
+    assert 'password_hash_duration_seconds_count' in body
+
+
+def test_query_metrics_require_admin(client: TestClient, token):
+    response = client.get('/metrics/queries')
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.get(
+        '/metrics/queries', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_metrics_collapse_unknown_methods_and_routes(client: TestClient):
+    http_metrics.routes.clear()
+
+    for n in range(3):
+        client.request(f'FOO{n}', '/todos/')
+        client.get(f'/does-not-exist/{n}')
+        client.request(f'BAR{n}', f'/does-not-exist/{n}')
+
+    body = client.get('/metrics').text
+
+    assert set(http_metrics.routes['/todos/']) == {'OTHER'}
+    assert set(http_metrics.routes['unmatched']) == {'OTHER'}
+    assert 'FOO' not in body
+    assert 'BAR' not in body
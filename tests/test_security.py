@@ -1,7 +1,20 @@
+import asyncio
+import threading
+
 import jwt
+import pytest
+from freezegun import freeze_time
 
-from fast_zero.helpers.security import create_access_token
+from fast_zero.helpers.calibrate import MIN_MEMORY_COST, calibrate
+from fast_zero.helpers.exceptions import ServiceUnavailableException
+from fast_zero.helpers.hashing import HashWorkerPool
+from fast_zero.helpers.security import (
+    create_access_token,
+    get_password_hash,
+    verify_password,
+)
 from fast_zero.helpers.settings import env
+from fast_zero.helpers.tokens import TokenService
 
 
 def test_jwt():
@@ -12,3 +25,77 @@ def test_jwt():
 
     assert decoded['sub'] == 'test'
     assert 'exp' in decoded
+
+
+@pytest.mark.anyio
+async def test_password_hash_runs_off_the_event_loop():
+    hashed = await get_password_hash('secret')
+
+    assert await verify_password('secret', hashed)
+    assert not await verify_password('wrong', hashed)
+
+
+@pytest.mark.anyio
+async def test_hash_pool_rejects_when_full():
+    pool = HashWorkerPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    running = asyncio.create_task(pool.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceUnavailableException):
+        await pool.run(release.set)
+
+    release.set()
+
+    assert await running
+    assert pool.pending == 0
+
+    pool.shutdown()
+
+
+def test_token_service_caches_verified_tokens():
+    service = TokenService('secret', 'HS256', expire_minutes=30, cache_size=8)
+    token = service.encode({'sub': 'test'})
+
+    first = service.decode(token)
+    second = service.decode(token)
+
+    assert first == second
+    assert service.cache.stats()['hits'] == 1
+
+
+def test_token_service_cache_is_bounded_by_exp():
+    service = TokenService('secret', 'HS256', expire_minutes=30, cache_size=8)
+
+    with freeze_time('2025-11-29 12:00:00'):
+        token = service.encode({'sub': 'test'})
+        service.decode(token)
+
+    with freeze_time('2025-11-29 12:30:01'):
+        with pytest.raises(jwt.ExpiredSignatureError):
+            service.decode(token)
+
+
+def test_token_service_does_not_trust_tampered_tokens():
+    service = TokenService('secret', 'HS256', expire_minutes=30, cache_size=8)
+    token = service.encode({'sub': 'test'})
+    service.decode(token)
+
+    header, _, signature = token.split('.')
+    payload = service.encode({'sub': 'admin'}).split('.')[1]
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        service.decode(f'{header}.{payload}.{signature}')
+
+
+def test_calibrate_lowers_memory_cost_for_tiny_targets():
+    parameters = calibrate(
+        target_seconds=0.0001,
+        memory_cost=MIN_MEMORY_COST * 2,
+        parallelism=1,
+        samples=1,
+    )
+
+    assert parameters['ARGON2_TIME_COST'] == 1
+    assert parameters['ARGON2_MEMORY_COST'] == MIN_MEMORY_COST
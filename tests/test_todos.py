@@ -1,8 +1,20 @@
+import json
+from datetime import datetime
+
+import httpx
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from fast_zero.app import app
+from fast_zero.db.connection import replicas
 from fast_zero.db.models import Todo, TodoState
+from fast_zero.db.replicas import STICKY_COOKIE
+from fast_zero.helpers.security import create_user_access_token
+from fast_zero.helpers.settings import env
+from fast_zero.routers.todos import stats_cache, todo_list_cache
 from tests.factories import TodoFactory
 
 
@@ -28,6 +40,21 @@ def test_create_todo(client, token, mock_db_time):
     }
 
 
+def test_create_todo_should_not_refresh(client, token, count_queries):
+    expected_queries = 2
+
+    with count_queries() as queries:
+        client.post(
+            '/todos/',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'title': 'Test todo', 'description': 'Test todo'},
+        )
+
+    assert len(queries) == expected_queries
+    assert queries[-1].startswith('INSERT INTO todos')
+    assert 'RETURNING' in queries[-1]
+
+
 async def test_list_todo_should_return_5_todos(
     session: AsyncSession, client: TestClient, user, token
 ):
@@ -59,6 +86,72 @@ async def test_list_todo_pagination_should_return_2_todos(
     assert len(response.json()['todos']) == expected_todos
 
 
+async def test_list_todo_cursor_should_walk_all_todos(
+    session: AsyncSession, client: TestClient, user, token
+):
+    expected_pages = 3
+    todos = TodoFactory.create_batch(5, user_id=user.id)
+
+    session.add_all(todos)
+    await session.commit()
+
+    pages = []
+    cursor = ''
+
+    while cursor is not None:
+        response = client.get(
+            f'/todos/?limit=2&cursor={cursor}',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+        body = response.json()
+        pages.append([todo['id'] for todo in body['todos']])
+        cursor = body['next_cursor']
+
+    assert len(pages) == expected_pages
+    assert sum(pages, []) == sorted(todo.id for todo in todos)
+
+
+def test_list_todo_invalid_cursor(client: TestClient, token):
+    response = client.get(
+        '/todos/?cursor=invalid',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+def test_list_todo_etag_should_return_304_until_todos_change(
+    client: TestClient, token
+):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get('/todos/', headers=headers)
+    etag = response.headers['ETag']
+
+    response = client.get(
+        '/todos/', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers['ETag'] == etag
+
+    client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 'Test', 'description': 'Test', 'state': 'draft'},
+    )
+
+    response = client.get(
+        '/todos/', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['ETag'] != etag
+    assert len(response.json()['todos']) == 1
+
+
 async def test_list_todo_filter_title_should_return_5_todos(
     session: AsyncSession, client: TestClient, user, token
 ):
@@ -176,6 +269,26 @@ async def test_patch_todo(
     assert response.json()['title'] == 'Test'
 
 
+async def test_patch_todo_should_use_a_single_statement(
+    session: AsyncSession, client: TestClient, user, token, count_queries
+):
+    expected_queries = 2
+    todo = TodoFactory(user_id=user.id)
+
+    session.add(todo)
+    await session.commit()
+
+    with count_queries() as queries:
+        client.patch(
+            f'/todos/{todo.id}',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'state': 'done'},
+        )
+
+    assert len(queries) == expected_queries
+    assert queries[-1].startswith('UPDATE todos')
+
+
 async def test_patch_wrong_user_todo(
     session: AsyncSession, client: TestClient, user, token, other_user
 ):
@@ -223,6 +336,26 @@ async def test_delete_todo(
     assert response.json() == {'message': 'Task has been deleted successfully'}
 
 
+async def test_delete_todo_should_use_a_single_statement(
+    session: AsyncSession, client: TestClient, user, token, count_queries
+):
+    expected_queries = 2
+    todo = TodoFactory(user_id=user.id)
+
+    session.add(todo)
+    await session.commit()
+
+    with count_queries() as queries:
+        client.delete(
+            f'/todos/{todo.id}',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert len(queries) == expected_queries
+    assert queries[-1].startswith('DELETE FROM todos')
+    assert await session.scalar(select(func.count(Todo.id))) == 0
+
+
 async def test_delete_wrong_user_todo(
     session: AsyncSession, client: TestClient, user, token, other_user
 ):
@@ -275,3 +408,448 @@ async def test_list_todos_should_return_all_expected_fields(
             'title': todo.title,
         }
     ]
+
+
+async def test_list_todos_row_and_model_serialization_match(
+    session: AsyncSession, client: TestClient, user, token, monkeypatch
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+
+    headers = {'Authorization': f'Bearer {token}'}
+
+    monkeypatch.setattr(env, 'LIST_SERIALIZATION', 'row')
+    row_response = client.get('/todos/?limit=2', headers=headers)
+
+    monkeypatch.setattr(env, 'LIST_SERIALIZATION', 'model')
+    todo_list_cache.clear()
+    model_response = client.get('/todos/?limit=2', headers=headers)
+
+    assert row_response.json() == model_response.json()
+    assert row_response.headers['ETag'] == model_response.headers['ETag']
+
+
+async def test_list_todos_served_from_cache_until_write(
+    session: AsyncSession, client: TestClient, user, token, count_queries
+):
+    session.add_all(TodoFactory.create_batch(2, user_id=user.id))
+    await session.commit()
+
+    headers = {'Authorization': f'Bearer {token}'}
+    first = client.get('/todos/', headers=headers)
+
+    with count_queries() as queries:
+        second = client.get('/todos/', headers=headers)
+
+    assert queries == []
+    assert second.content == first.content
+    assert second.headers['ETag'] == first.headers['ETag']
+
+    client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 'Test', 'description': 'Test', 'state': 'draft'},
+    )
+
+    expected_todos = 3
+    response = client.get('/todos/', headers=headers)
+
+    assert len(response.json()['todos']) == expected_todos
+    assert todo_list_cache.stats()['hits'] == 1
+
+
+def test_create_todo_sticks_reads_to_primary(client: TestClient, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get('/todos/', headers=headers)
+
+    assert STICKY_COOKIE not in response.cookies
+
+    response = client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 'Test', 'description': 'Test', 'state': 'draft'},
+    )
+
+    assert replicas.writers.get(user.id)
+    assert response.cookies[STICKY_COOKIE] == '1'
+
+
+def test_list_todo_limit_above_max_page_size(client: TestClient, token):
+    response = client.get(
+        f'/todos/?limit={env.MAX_PAGE_SIZE + 1}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_export_todos_should_stream_all_todos(
+    session: AsyncSession, client: TestClient, user, token, other_user
+):
+    expected_todos = 7
+
+    session.add_all(TodoFactory.create_batch(7, user_id=user.id))
+    session.add_all(TodoFactory.create_batch(2, user_id=other_user.id))
+    await session.commit()
+
+    response = client.get(
+        '/todos/export',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    todos = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert len(todos) == expected_todos
+    assert [todo['id'] for todo in todos] == sorted(t['id'] for t in todos)
+
+
+async def test_export_todos_opens_its_own_read_session(
+    session: AsyncSession, isolated_client: TestClient, user
+):
+    expected_todos = 3
+
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+
+    response = isolated_client.get(
+        '/todos/export',
+        headers={'Authorization': f'Bearer {create_user_access_token(user)}'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.text.splitlines()) == expected_todos
+
+
+async def test_export_todos_filter_state(
+    session: AsyncSession, client: TestClient, user, token
+):
+    expected_todos = 3
+
+    session.add_all(
+        TodoFactory.create_batch(3, state=TodoState.done, user_id=user.id)
+    )
+    session.add_all(
+        TodoFactory.create_batch(2, state=TodoState.doing, user_id=user.id)
+    )
+    await session.commit()
+
+    response = client.get(
+        '/todos/export?state=done',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert len(response.text.splitlines()) == expected_todos
+
+
+def test_create_todos_batch(client: TestClient, token):
+    response = client.post(
+        '/todos/batch',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'todos': [
+                {'title': 'First', 'description': 'First todo'},
+                {'title': 'Second', 'description': 'Second todo'},
+            ]
+        },
+    )
+
+    results = response.json()['results']
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [r['status_code'] for r in results] == [201, 201]
+    assert [r['todo']['title'] for r in results] == ['First', 'Second']
+    assert all(r['id'] == r['todo']['id'] for r in results)
+
+
+def test_create_todos_batch_above_max_size(client: TestClient, token):
+    todo = {'title': 'Todo', 'description': 'Todo'}
+
+    response = client.post(
+        '/todos/batch',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'todos': [todo] * (env.MAX_BATCH_SIZE + 1)},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_patch_todos_batch(
+    session: AsyncSession, client: TestClient, user, token, other_user
+):
+    todo = TodoFactory(user_id=user.id, state=TodoState.todo)
+    other_todo = TodoFactory(user_id=user.id, state=TodoState.todo)
+    todo_other_user = TodoFactory(user_id=other_user.id)
+
+    session.add_all([todo, other_todo, todo_other_user])
+    await session.commit()
+
+    response = client.patch(
+        '/todos/batch',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'todos': [
+                {'id': todo.id, 'title': 'Edited'},
+                {'id': other_todo.id, 'state': 'done'},
+                {'id': todo_other_user.id, 'title': 'Edited'},
+            ]
+        },
+    )
+
+    results = response.json()['results']
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [r['status_code'] for r in results] == [200, 200, 404]
+    assert results[0]['todo']['title'] == 'Edited'
+    assert results[0]['todo']['state'] == 'todo'
+    assert results[1]['todo']['title'] == other_todo.title
+    assert results[1]['todo']['state'] == 'done'
+    assert results[2]['todo'] is None
+
+
+async def test_delete_todos_batch(
+    session: AsyncSession, client: TestClient, user, token, other_user
+):
+    todo = TodoFactory(user_id=user.id)
+    todo_other_user = TodoFactory(user_id=other_user.id)
+
+    session.add_all([todo, todo_other_user])
+    await session.commit()
+
+    response = client.request(
+        'DELETE',
+        '/todos/batch',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'ids': [todo.id, todo_other_user.id, 42]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        'results': [
+            {'id': todo.id, 'status_code': 200, 'todo': None},
+            {'id': todo_other_user.id, 'status_code': 404, 'todo': None},
+            {'id': 42, 'status_code': 404, 'todo': None},
+        ]
+    }
+    assert await session.scalar(select(func.count(Todo.id))) == 1
+
+
+async def test_todo_stats_should_count_by_state(
+    session: AsyncSession, client: TestClient, user, token
+):
+    session.add_all(
+        TodoFactory.create_batch(3, state=TodoState.done, user_id=user.id)
+    )
+    session.add_all(
+        TodoFactory.create_batch(2, state=TodoState.doing, user_id=user.id)
+    )
+    await session.commit()
+
+    response = client.get(
+        '/todos/stats', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['states'] == {
+        'draft': 0,
+        'todo': 0,
+        'doing': 2,
+        'done': 3,
+        'trash': 0,
+    }
+
+
+async def test_todo_stats_histograms_respect_range(
+    session: AsyncSession, client: TestClient, user, token, mock_db_time
+):
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 1, 10)):
+        session.add_all(TodoFactory.create_batch(2, user_id=user.id))
+        await session.commit()
+
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 3, 10)):
+        session.add_all(TodoFactory.create_batch(1, user_id=user.id))
+        await session.commit()
+
+    response = client.get(
+        '/todos/stats?start=2025-01-01T00:00:00&end=2025-01-02T00:00:00',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    expected = [{'bucket': '2025-01-01T00:00:00', 'count': 2}]
+
+    assert response.json()['created'] == expected
+    assert response.json()['updated'] == expected
+
+
+def test_todo_stats_cache_is_invalidated_by_writes(client: TestClient, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.get('/todos/stats', headers=headers)
+    client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 'Test', 'description': 'Test', 'state': 'done'},
+    )
+    response = client.get('/todos/stats', headers=headers)
+
+    assert response.json()['states']['done'] == 1
+
+
+def test_todo_stats_cache_is_bounded_per_user(
+    client: TestClient, token, monkeypatch
+):
+    max_size = 3
+    headers = {'Authorization': f'Bearer {token}'}
+    monkeypatch.setattr(stats_cache, 'max_size', max_size)
+
+    for day in range(1, 10):
+        client.get(
+            '/todos/stats',
+            headers=headers,
+            params={'start': f'2025-01-{day:02}T00:00:00'},
+        )
+
+    assert len(stats_cache) == max_size
+
+
+async def test_list_todo_search_should_rank_results(
+    session: AsyncSession, client: TestClient, user, token
+):
+    weak = TodoFactory(
+        user_id=user.id, title='Groceries', description='Buy milk for python'
+    )
+    strong = TodoFactory(
+        user_id=user.id,
+        title='Python talk',
+        description='Prepare the python slides about pythons',
+    )
+    unrelated = TodoFactory(
+        user_id=user.id, title='Gym', description='Leg day'
+    )
+
+    session.add_all([weak, strong, unrelated])
+    await session.commit()
+
+    response = client.get(
+        '/todos/?q=python',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert [todo['id'] for todo in response.json()['todos']] == [
+        strong.id,
+        weak.id,
+    ]
+
+
+async def test_list_todo_search_should_stem_words(
+    session: AsyncSession, client: TestClient, user, token
+):
+    todo = TodoFactory(user_id=user.id, title='Running', description='5km')
+
+    session.add(todo)
+    await session.commit()
+
+    response = client.get(
+        '/todos/?q=runs',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert [todo['id'] for todo in response.json()['todos']] == [todo.id]
+
+
+def test_list_todo_search_with_cursor(client: TestClient, token):
+    response = client.get(
+        '/todos/?q=python&cursor=MQ==',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {
+        'detail': 'Cursor pagination is not supported with q'
+    }
+
+
+async def test_list_todo_search_etag_tracks_matching_todos(
+    session: AsyncSession, client: TestClient, user, token, query_budget
+):
+    todo = TodoFactory(user_id=user.id, title='Python', description='Talk')
+
+    session.add(todo)
+    await session.commit()
+
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with query_budget(2):
+        response = client.get('/todos/?q=python', headers=headers)
+
+    etag = response.headers['ETag']
+    response = client.get(
+        '/todos/?q=python', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.patch(
+        f'/todos/{todo.id}', headers=headers, json={'title': 'Pythons'}
+    )
+    response = client.get(
+        '/todos/?q=python', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['todos'][0]['title'] == 'Pythons'
+
+
+async def test_list_todos_holds_one_connection_at_a_time(
+    isolated_sessions: AsyncEngine, user
+):
+    checked_out = 0
+    most_checked_out = 0
+
+    def on_checkout(*args):
+        nonlocal checked_out, most_checked_out
+        checked_out += 1
+        most_checked_out = max(most_checked_out, checked_out)
+
+    def on_checkin(*args):
+        nonlocal checked_out
+        checked_out -= 1
+
+    pool = isolated_sessions.sync_engine.pool
+    event.listen(pool, 'checkout', on_checkout)
+    event.listen(pool, 'checkin', on_checkin)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        response = await client.get(
+            '/todos/',
+            headers={
+                'Authorization': f'Bearer {create_user_access_token(user)}'
+            },
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert most_checked_out == 1
+    assert checked_out == 0
+
+
+def test_todo_routes_stay_within_query_budget(
+    client: TestClient, token, query_budget
+):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with query_budget(2):
+        response = client.post(
+            '/todos/',
+            headers=headers,
+            json={'title': 'Test', 'description': 'Test', 'state': 'draft'},
+        )
+        todo_id = response.json()['id']
+
+        client.get('/todos/', headers=headers)
+        client.get('/todos/stats', headers=headers)
+        client.patch(f'/todos/{todo_id}', headers=headers, json={'title': 'x'})
+        client.delete(f'/todos/{todo_id}', headers=headers)
@@ -1,6 +1,19 @@
+import asyncio
+
+import httpx
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from fast_zero.app import app
+from fast_zero.helpers.security import (
+    create_user_access_token,
+    get_password_hash,
+    hash_pool,
+    principal_cache,
+    snapshot_user,
+    user_cache,
+)
+from fast_zero.routers import users
 from fast_zero.schemas.schemas import UserPublic
 
 
@@ -50,6 +63,40 @@ def test_create_user_email_already_exists(client: TestClient, user):
     assert response.json() == {'detail': 'Email already exists'}
 
 
+def test_create_user_duplicate_should_not_hash_password(
+    client: TestClient, user
+):
+    hashes = hash_pool.durations.count
+
+    for payload in (
+        {'username': user.username, 'email': 'different@email.com'},
+        {'username': 'Different Username', 'email': user.email},
+    ):
+        response = client.post(
+            '/users', json={**payload, 'password': 'does not matter'}
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    assert hash_pool.durations.count == hashes
+
+
+def test_create_user_stays_within_query_budget(
+    client: TestClient, query_budget
+):
+    with query_budget(2):
+        response = client.post(
+            '/users',
+            json={
+                'username': 'JohnDoe',
+                'email': 'johndoe@email.com',
+                'password': 'supersecretpassword',
+            },
+        )
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+
 def test_get_all_users(client: TestClient, user, other_user, token):
     user_schema = UserPublic.model_validate(user).model_dump()
     other_user_schema = UserPublic.model_validate(other_user).model_dump()
@@ -60,7 +107,30 @@ def test_get_all_users(client: TestClient, user, other_user, token):
     )
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.json() == {'users': [user_schema, other_user_schema]}
+    assert response.json() == {
+        'users': [user_schema, other_user_schema],
+        'next_cursor': None,
+    }
+
+
+def test_get_users_with_cursor(client: TestClient, user, other_user, token):
+    response = client.get(
+        '/users/?limit=1',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    first_page = response.json()
+
+    response = client.get(
+        f'/users/?limit=1&cursor={first_page["next_cursor"]}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    second_page = response.json()
+
+    assert [u['id'] for u in first_page['users']] == [user.id]
+    assert [u['id'] for u in second_page['users']] == [other_user.id]
+    assert second_page['next_cursor'] is None
 
 
 def test_get_user_by_id(client: TestClient, user, token):
@@ -75,6 +145,47 @@ def test_get_user_by_id(client: TestClient, user, token):
     assert response.json() == user_schema
 
 
+def test_get_user_by_id_etag_should_return_304(
+    client: TestClient, user, token
+):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get(f'/users/{user.id}', headers=headers)
+    etag = response.headers['ETag']
+
+    response = client.get(
+        f'/users/{user.id}', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers['ETag'] == etag
+
+
+def test_get_users_etag_should_change_with_new_user(
+    client: TestClient, user, token
+):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get('/users/', headers=headers)
+    etag = response.headers['ETag']
+
+    client.post(
+        '/users',
+        json={
+            'username': 'JohnDoe',
+            'email': 'johndoe@email.com',
+            'password': 'supersecretpassword',
+        },
+    )
+
+    response = client.get(
+        '/users/', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['ETag'] != etag
+
+
 def test_get_non_existing_user_by_id(client: TestClient, user, token):
     response = client.get(
         f'/users/{user.id + 1}',
@@ -104,6 +215,47 @@ def test_update_user(client: TestClient, user, token):
     }
 
 
+def test_update_user_should_not_refresh(
+    client: TestClient, user, token, count_queries
+):
+    expected_queries = 1
+
+    with count_queries() as queries:
+        response = client.put(
+            f'/users/{user.id}',
+            headers={'Authorization': f'Bearer {token}'},
+            json={
+                'username': 'JohnDoeEdited',
+                'email': 'johndoeedited@email.com',
+                'password': 'supersecretpassword',
+            },
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(queries) == expected_queries
+    assert queries[-1].startswith('UPDATE users')
+    assert 'RETURNING' in queries[-1]
+
+
+def test_update_user_revokes_previous_tokens(client: TestClient, user, token):
+    client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': user.username,
+            'email': user.email,
+            'password': 'new-password',
+        },
+    )
+
+    response = client.get(
+        '/todos/', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
+
+
 def test_update_wrong_user(client: TestClient, other_user, token):
     response = client.put(
         f'/users/{other_user.id}',
@@ -157,3 +309,109 @@ def test_delete_wrong_user(client: TestClient, other_user, token):
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
     assert response.json() == {'detail': 'Not enough permissions'}
+
+
+def test_update_user_invalidates_cached_user(client: TestClient, user, token):
+    client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'JohnDoeEdited',
+            'email': 'johndoeedited@email.com',
+            'password': 'supersecretpassword',
+        },
+    )
+
+    response = client.delete(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_user_routes_stay_within_query_budget(
+    client: TestClient, user, token, query_budget
+):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with query_budget(3):
+        client.get('/users/', headers=headers)
+        client.get(f'/users/{user.id}', headers=headers)
+        client.put(
+            f'/users/{user.id}',
+            headers=headers,
+            json={
+                'username': 'bob',
+                'email': 'bob@example.com',
+                'password': 'mynewpassword',
+            },
+        )
+
+
+async def test_update_user_revokes_token_used_during_hashing(
+    isolated_sessions, monkeypatch, user
+):
+    hashing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_hash(password: str):
+        hashing.set()
+        await release.wait()
+
+        return await get_password_hash(password)
+
+    monkeypatch.setattr(users, 'get_password_hash', slow_hash)
+    headers = {'Authorization': f'Bearer {create_user_access_token(user)}'}
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        update = asyncio.create_task(
+            client.put(
+                f'/users/{user.id}',
+                headers=headers,
+                json={
+                    'username': 'bob',
+                    'email': 'bob@example.com',
+                    'password': 'mynewpassword',
+                },
+            )
+        )
+        await hashing.wait()
+
+        during = await client.get('/todos/', headers=headers)
+        release.set()
+        updated = await update
+
+        after = await client.get('/todos/', headers=headers)
+
+    assert during.status_code == status.HTTP_200_OK
+    assert updated.status_code == status.HTTP_200_OK
+    assert after.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_revoked_token_cannot_change_account_with_stale_caches(
+    client: TestClient, user, token
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    stale_user = snapshot_user(user)
+    payload = {
+        'username': user.username,
+        'email': user.email,
+        'password': 'new-password',
+    }
+
+    client.put(f'/users/{user.id}', headers=headers, json=payload)
+
+    user_cache.set(user.id, stale_user)
+    principal_cache.set(user.id, stale_user['token_version'])
+
+    response = client.put(f'/users/{user.id}', headers=headers, json=payload)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.delete(f'/users/{user.id}', headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED